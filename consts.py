@@ -1,2 +1,5 @@
+import os
+
 OI_URL = "http://www.openinsider.com"
-TEMPORAL_GBS = ["Day", "Week", "Month", "Year"]
\ No newline at end of file
+TEMPORAL_GBS = ["Day", "Week", "Month", "Quarter", "Year"]
+DATA_DIR = os.environ.get("INSIDER_TRADING_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data"))
@@ -0,0 +1,46 @@
+from typing import Tuple
+import pandas as pd
+
+from open_insider.rollup import get_rollup_cube
+from utils.instrumentation import span
+
+
+AGGREGATIONS = {
+    "Total": lambda df_rollup: df_rollup["Total"],
+    "Average": lambda df_rollup: df_rollup["Total"] / df_rollup["Value Count"],
+    "Count": lambda df_rollup: df_rollup["Count"],
+}
+
+# Insider-activity signals (see `open_insider.signals`)
+SIGNAL_AGGREGATIONS = {
+    "Net Purchases": lambda df_rollup: df_rollup["Net Value"],
+    "Rolling Net Purchases": lambda df_rollup: df_rollup["Rolling Net Value"],
+    "Cluster Buys": lambda df_rollup: df_rollup["Cluster Buys"],
+    "First Buys": lambda df_rollup: df_rollup["First Buys"],
+}
+AGGREGATIONS.update(SIGNAL_AGGREGATIONS)
+
+
+def apply_gb_and_agg(
+    groupby: str,
+    aggregation: str,
+    dataset: pd.DataFrame,
+    split_trade_types: bool = False,
+) -> Tuple[pd.DataFrame, str]:
+    """
+    Aggregates `dataset` by `groupby` (a company or time bucket), one row per group; with `split_trade_types`,
+    one row per group and trade type, with the trade type in a "Trade Type" column.
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"{aggregation}: Invalid value for aggregation; choose from {list(AGGREGATIONS.keys())}")
+    with span("groupby", groupby=groupby, aggregation=aggregation):
+        df_rollup = get_rollup_cube(dataset).rollup(groupby, split_trade_types=split_trade_types)
+        df_plot = AGGREGATIONS[aggregation](df_rollup)
+    x = "Company Name" if groupby == "Company" else "Trade Date"
+    if split_trade_types:
+        df_plot = df_plot.stack(future_stack=True).rename(aggregation).reset_index()
+        df_plot.columns = [x, "Trade Type", aggregation]
+    else:
+        df_plot = df_plot.rename(aggregation).reset_index()
+        df_plot.columns = [x, aggregation]
+    return df_plot, x
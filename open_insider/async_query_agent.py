@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+import pandas as pd
+
+from open_insider.query import Query
+from open_insider.query_agent import QueryAgent
+from open_insider.query_predicate import QueryPredicate
+
+
+TradeTypes = Optional[Union[str, List[str]]]
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncQueryAgent(QueryAgent):
+    """
+    `QueryAgent` that scrapes several queries at once, e.g. the series of a comparison chart.
+
+    Queries answered by remembered or stored data are not fetched. Of the rest, duplicate queries and queries whose
+    results are contained in another's are answered from that query's results, and the remaining queries are fetched
+    concurrently, at most `max_concurrency` at a time. Results are yielded as they complete.
+    """
+
+    def __init__(self, *args, max_concurrency: Optional[int] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency or self.fetcher.max_workers
+
+    @staticmethod
+    def covering_queries(queries: List[Query]) -> Dict[int, int]:
+        """
+        Index of the query whose results each query is answered from: itself if it must be fetched, or another
+        query returning at least as many of the latest trades of a wider selection (the first of identical queries).
+        """
+        predicates = [QueryPredicate.from_query(query) for query in queries]
+
+        def covers(j: int, i: int) -> bool:
+            if j == i or not predicates[j].contains(predicates[i]) or queries[j].num_results < queries[i].num_results:
+                return False
+            is_identical = predicates[i].contains(predicates[j]) and queries[i].num_results == queries[j].num_results
+            return not is_identical or j < i
+
+        roots = [i for i in range(len(queries)) if not any(covers(j, i) for j in range(len(queries)))]
+        return {i: next((j for j in roots if j == i or covers(j, i)), i) for i in range(len(queries))}
+
+    async def fetch_async(self, query: Query, semaphore: asyncio.Semaphore) -> pd.DataFrame:
+        async with semaphore:
+            return await asyncio.to_thread(self.fetch, query)
+
+    async def scrape_many(
+        self,
+        queries: List[Query],
+        trade_types: Optional[List[TradeTypes]] = None,
+    ) -> AsyncIterator[Tuple[int, pd.DataFrame]]:
+        """
+        Scrapes `queries` (each filtered to the trade types at the same position of `trade_types`; purchases and
+        sales by default), yielding the position and filtered results of each query as soon as they are available.
+        """
+        trade_types = trade_types or [["P", "S"]] * len(queries)
+        if len(trade_types) != len(queries):
+            raise ValueError(f"Got {len(trade_types)} trade type selections for {len(queries)} queries.")
+        predicates = [QueryPredicate.from_query(query, trade_types=types) for query, types in zip(queries, trade_types)]
+
+        def filtered(i: int, df: pd.DataFrame) -> pd.DataFrame:
+            return self.filter_df(
+                df,
+                trade_types=trade_types[i],
+                trade_val_min=queries[i].trade_val_min,
+                trade_val_max=queries[i].trade_val_max,
+            )
+
+        pending = []
+        for i, predicate in enumerate(predicates):
+            df = self.get_existing_data(predicate)
+            if df is None:
+                df = await asyncio.to_thread(self.get_stored_data, predicate)
+            if df is None:
+                pending.append(i)
+            else:
+                yield i, filtered(i, df)
+        if not pending:
+            return
+
+        covering = self.covering_queries([queries[i] for i in pending])
+        dependents: Dict[int, List[int]] = {}
+        for position, root in covering.items():
+            if position != root:
+                dependents.setdefault(pending[root], []).append(pending[position])
+        roots = [i for position, i in enumerate(pending) if covering[position] == position]
+        logger.info(f"Fetching {len(roots)} of {len(pending)} uncached queries; "
+                    f"the rest are answered from their results")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = {asyncio.create_task(self.fetch_async(queries[i], semaphore)): i for i in roots}
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = tasks.pop(task)
+                try:
+                    df = task.result()
+                except Exception as e:
+                    logger.warning(f"Error during scraping: {e}")
+                    df = pd.DataFrame()
+                if not df.empty and self.remember:
+                    self.remember_data(queries[i].params, df)
+                yield i, filtered(i, df)
+                for dependent in dependents.pop(i, []):
+                    if queries[dependent].url == queries[i].url:  # Duplicate query
+                        answer = df if not df.empty else None
+                    else:
+                        answer = self.answer_from(predicates[dependent], queries[i].params, df)
+                    if answer is None:  # Too few of the covering query's results match: fetch it after all
+                        tasks[asyncio.create_task(self.fetch_async(queries[dependent], semaphore))] = dependent
+                    else:
+                        yield dependent, filtered(dependent, answer)
+
+    def scrape_all(
+        self,
+        queries: List[Query],
+        trade_types: Optional[List[TradeTypes]] = None,
+    ) -> List[pd.DataFrame]:
+        """Scrapes `queries` as `scrape_many` does, returning their results in the order given."""
+
+        async def collect() -> List[pd.DataFrame]:
+            results = [None] * len(queries)
+            async for i, df in self.scrape_many(queries, trade_types=trade_types):
+                results[i] = df
+            return results
+
+        return asyncio.run(collect())
@@ -0,0 +1,158 @@
+"""
+Backfills the local trade store with filings beyond the 5000-row screener cap.
+
+Usage (from the repository root):
+    python -m open_insider.backfill --start 2022-01-01 --end 2024-12-31 --window-days 7 --concurrency 4
+
+The date range is split into filing-date windows that are fetched in parallel, newest first. Each completed
+window is checkpointed in the store's metadata, so an interrupted run resumes where it stopped when it is run
+again with the same --start and --window-days.
+"""
+import argparse
+import logging
+from datetime import date, timedelta
+from typing import List, Tuple, Dict, Optional
+import pandas as pd
+
+from open_insider.query import Query
+from open_insider.query_agent import QueryAgent
+from open_insider.trade_store import TradeStore
+from open_insider.fetcher import Fetcher
+from open_insider.parameters.filing_date import FilingDateParams
+from utils.instrumentation import span
+
+
+logger = logging.getLogger(__name__)
+
+
+class Backfill:
+
+    def __init__(
+        self,
+        start: str | date,
+        end: Optional[str | date] = None,
+        window_days: int = 7,
+        concurrency: int = 4,
+        store: Optional[TradeStore] = None,
+        max_pages: int = 20,
+    ) -> None:
+        self.start, self.end = FilingDateParams.validate(start, end or date.today())
+        if window_days < 1:
+            raise ValueError(f"{window_days}: `window_days` must be a positive integer.")
+        self.window_days = window_days
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.store = store or TradeStore()
+        self.query_agent = QueryAgent(remember=False, store=self.store, fetcher=Fetcher(max_workers=concurrency))
+
+    @property
+    def windows(self) -> List[Tuple[date, date]]:
+        """
+        Inclusive filing-date windows covering the range, newest first. Windows are counted from `start`, so a run
+        resumed later with the same start (and a later or default end) finds the windows it checkpointed.
+        """
+        windows = []
+        window_start = self.start
+        while window_start <= self.end:
+            window_end = min(window_start + timedelta(days=self.window_days - 1), self.end)
+            windows.append((window_start, window_end))
+            window_start = window_end + timedelta(days=1)
+        return windows[::-1]
+
+    @staticmethod
+    def window_key(window: Tuple[date, date]) -> str:
+        return f"{window[0]}/{window[1]}"
+
+    @property
+    def completed(self) -> List[str]:
+        return self.store.read_meta().get("backfill_completed", [])
+
+    def fetch_windows(self, windows: List[Tuple[date, date]]) -> Dict[Tuple[date, date], Tuple[pd.DataFrame, bool]]:
+        """
+        Fetches every page of each window, requesting the pages of all windows concurrently. Returns the trades of
+        each window and whether they are complete: a window is cut short after `max_pages` pages, or when a page
+        repeats the previous one (e.g. if the screener clamps the page number past its last page).
+        """
+        frames = {window: [] for window in windows}
+        complete = dict.fromkeys(windows, True)
+        queries = {
+            window: Query(num_results=self.query_agent.max_rows, filing_date_min=window[0], filing_date_max=window[1])
+            for window in windows
+        }
+        previous_keys: Dict[Tuple[date, date], pd.Index] = {}
+        while queries:
+            pages = self.query_agent.fetch_many(list(queries.values()))
+            next_queries = {}
+            for (window, query), df in zip(queries.items(), pages):
+                keys = pd.Index(TradeStore.trade_keys(df)) if not df.empty else pd.Index([])
+                if window in previous_keys and not keys.empty and keys.isin(previous_keys[window]).all():
+                    logger.warning(f"Window {self.window_key(window)}: page {query.page} repeats the previous page; "
+                                   f"leaving the window incomplete")
+                    complete[window] = False
+                    continue
+                frames[window].append(df)
+                previous_keys[window] = keys
+                if len(df) >= query.num_results:  # Truncated window: fetch its next page in the next round
+                    if query.page >= self.max_pages:
+                        logger.warning(f"Window {self.window_key(window)}: still truncated after {self.max_pages} pages; "
+                                       f"leaving the window incomplete (use a smaller --window-days)")
+                        complete[window] = False
+                    else:
+                        next_queries[window] = Query(**{**query.params, "page": query.page + 1})
+            queries = next_queries
+        return {window: (pd.concat(dfs, ignore_index=True), complete[window]) for window, dfs in frames.items()}
+
+    def run(self) -> int:
+        """Fetches every window not yet checkpointed; returns the number of new trades stored."""
+        completed = set(self.completed)
+        pending = [window for window in self.windows if self.window_key(window) not in completed]
+        logger.info(f"Backfilling {len(pending)} of {len(self.windows)} windows from {self.start} to {self.end}")
+        num_new = 0
+        for i in range(0, len(pending), self.concurrency):
+            batch = pending[i:i + self.concurrency]
+            with span("backfill_batch", windows=len(batch)):
+                fetched = self.fetch_windows(batch)
+            for window, (df, complete) in fetched.items():
+                num_new += self.store.write(df)
+                if complete:
+                    completed.add(self.window_key(window))
+            with self.store.write_lock():  # Keeps the checkpoints of a backfill running in another process
+                completed |= set(self.completed)
+                self.store.update_meta(backfill_completed=sorted(completed))
+            logger.info(f"Backfilled {min(i + self.concurrency, len(pending))}/{len(pending)} windows "
+                        f"({num_new} new trades)")
+        self.extend_coverage(completed)
+        return num_new
+
+    def extend_coverage(self, completed: set) -> None:
+        """Moves the store's covered window back to the backfill start once every window up to it is complete."""
+        covered_since = self.store.covered_since
+        if covered_since is None or not all(self.window_key(window) in completed for window in self.windows):
+            return
+        if pd.Timestamp(self.end) + pd.Timedelta(days=1) > covered_since:  # Backfill reaches the covered window
+            start = pd.Timestamp(self.start) - pd.Timedelta(seconds=1)  # Every filing after this is now stored
+            self.store.update_meta(covered_since=str(min(start, covered_since)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill the local OpenInsider trade store by filing-date windows.")
+    parser.add_argument("--start", required=True, help="First filing date to backfill (YYYY-MM-DD).")
+    parser.add_argument("--end", default=None, help="Last filing date to backfill (YYYY-MM-DD); defaults to today.")
+    parser.add_argument("--window-days", type=int, default=7, help="Days of filings per screener query.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of concurrent requests.")
+    parser.add_argument("--max-pages", type=int, default=20, help="Maximum screener pages fetched per window.")
+    parser.add_argument("--store", default=None, help="Trade store directory; defaults to the app's store.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    Backfill(
+        start=args.start,
+        end=args.end,
+        window_days=args.window_days,
+        concurrency=args.concurrency,
+        store=TradeStore(args.store) if args.store else None,
+        max_pages=args.max_pages,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
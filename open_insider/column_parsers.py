@@ -0,0 +1,112 @@
+from typing import Dict, Callable
+from functools import partial
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from open_insider.parameters.job_titles import JobTitlesParam
+from open_insider.parameters.trade_types import TradeTypesParam
+
+
+CATEGORICAL_COLUMNS = ["Ticker", "Company Name", "Insider Name", "Title", "Trade Type"]
+TRADE_CODE_DTYPE = pd.CategoricalDtype(list(TradeTypesParam.trade_types))
+ID_DTYPE = "Int64"  # SEC identifiers (e.g. an insider's CIK), missing for rows without a link
+
+# Numeric columns, parsed together in a single pass, with the divisor applied to each and its final dtype.
+# float32 keeps ~7 significant digits: enough for prices and ownership changes, but not for dollar values.
+NUMBER_COLUMNS = {
+    "Price": (1.0, "float32"),
+    "Value": (1.0, "float64"),
+    "ΔOwn": (100.0, "float32"),
+    "Qty": (1.0, "int64"),
+    "Owned": (1.0, "int64"),
+}
+
+
+def parse_number_columns(df: pd.DataFrame, columns: Dict[str, tuple] = NUMBER_COLUMNS) -> pd.DataFrame:
+    """
+    Parses currency, count and percent strings (e.g. "-$1,234", "+1,000", ">999%") of all `columns` at once
+    with Arrow compute kernels; values that are not numbers (e.g. "New") become NaN.
+    """
+    columns = {column: spec for column, spec in columns.items() if column in df.columns}
+    if not columns or df.empty:
+        return df
+    strings = pa.chunked_array([pa.array(df[column].values, type=pa.string(), from_pandas=True) for column in columns])
+    for symbol in "$,+%>":
+        strings = pc.replace_substring(strings, pattern=symbol, replacement="")
+    strings = pc.if_else(pc.match_substring_regex(strings, pattern=r"^-?\d*\.?\d+$"), strings, None)
+    numbers = pc.cast(strings, pa.float64()).to_numpy(zero_copy_only=False)
+    for column, values in zip(columns, np.split(numbers, len(columns))):
+        scale, dtype = columns[column]
+        df[column] = (values / scale if scale != 1.0 else values).astype(dtype)
+    return df
+
+
+def parse_datetime_column(values: pd.Series, format: str) -> pd.Series:
+    return pd.to_datetime(values, format=format, errors="coerce")
+
+
+def parse_categorical_column(values: pd.Series) -> pd.Series:
+    return values.astype("category")
+
+
+def parse_id_column(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values, errors="coerce").astype(ID_DTYPE)
+
+
+COLUMN_PARSERS: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    "Filing Date": partial(parse_datetime_column, format="%Y-%m-%d %H:%M:%S"),
+    "Trade Date": partial(parse_datetime_column, format="%Y-%m-%d"),
+    "X": parse_categorical_column,
+    "Insider CIK": parse_id_column,
+    **{column: parse_categorical_column for column in CATEGORICAL_COLUMNS},
+}
+
+
+def parse_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts the raw strings of a screener table to typed columns."""
+    for column, parser in COLUMN_PARSERS.items():
+        if column in df.columns:
+            df[column] = parser(df[column])
+    return parse_number_columns(df)
+
+
+def title_mask_column(titles: pd.Series) -> pd.Series:
+    """Multi-hot `JobTitlesParam.JOB_TITLE_MAP` bitmask of each title, parsing each distinct title only once."""
+    titles = titles.astype("category")
+    category_masks = np.array(
+        [JobTitlesParam.to_mask(JobTitlesParam.parse_title(title)) for title in titles.cat.categories] + [
+            JobTitlesParam.to_mask(["Other"])  # Missing titles (code -1)
+        ],
+        dtype=np.uint16,
+    )
+    return pd.Series(category_masks[titles.cat.codes.values], index=titles.index, name="Title Mask")
+
+
+def trade_code_column(trade_types: pd.Series) -> pd.Series:
+    """`TradeTypesParam.trade_types` code of each trade type (e.g. "S - Sale+OE" -> "S"), splitting each distinct type once."""
+    trade_types = trade_types.astype("category")
+    category_codes = np.array(
+        [TRADE_CODE_DTYPE.categories.get_indexer([str(tt).split(" - ")[0]])[0] for tt in trade_types.cat.categories] + [
+            -1  # Missing trade types (code -1)
+        ],
+        dtype=np.int8,
+    )
+    codes = pd.Categorical.from_codes(category_codes[trade_types.cat.codes.values], dtype=TRADE_CODE_DTYPE)
+    return pd.Series(codes, index=trade_types.index, name="Trade Code")
+
+
+def restore_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Re-applies the compact dtypes lost when frames with different categories or numeric dtypes are concatenated."""
+    for column in ["Filing Type"] + CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    if "Trade Code" in df.columns and df["Trade Code"].dtype != TRADE_CODE_DTYPE:
+        df["Trade Code"] = df["Trade Code"].astype(TRADE_CODE_DTYPE)
+    if "Insider CIK" in df.columns and df["Insider CIK"].dtype != ID_DTYPE:
+        df["Insider CIK"] = df["Insider CIK"].astype(ID_DTYPE)
+    for column, (_, dtype) in NUMBER_COLUMNS.items():
+        if column in df.columns and df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+    return df
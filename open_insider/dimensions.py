@@ -0,0 +1,102 @@
+import re
+from functools import cached_property
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+
+_NON_NAME_CHARACTERS = re.compile(r"[^A-Z0-9 ]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case, punctuation and spacing-insensitive form of a name (e.g. "Cook Timothy D." -> "COOK TIMOTHY D")."""
+    return " ".join(_NON_NAME_CHARACTERS.sub(" ", str(name).upper()).split())
+
+
+def _latest_rows(ids: np.ndarray, filing_dates: np.ndarray, num_ids: int) -> np.ndarray:
+    """Position of the latest filing of each id in `0..num_ids - 1` (each of which must have a filing)."""
+    order = np.lexsort((-filing_dates.astype("datetime64[ns]").astype(np.int64), ids))
+    sorted_ids = ids[order]
+    return order[np.searchsorted(sorted_ids, np.arange(num_ids))]
+
+
+class Dimensions:
+    """
+    Insider and company dimension tables of a trade frame, and the integer key of each trade's insider and company.
+
+    Insiders are keyed by their SEC CIK (from their OpenInsider link); trades without one are matched to a CIK by
+    normalized name, or else keyed by that name. Insiders are named after their latest filing. Companies are keyed
+    by ticker, with every name filed under it, latest first. Keys are computed once per distinct (CIK, name) and
+    (ticker, name) pair, not per trade.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        filing_dates = df["Filing Date"].to_numpy()
+        names = df["Insider Name"].astype("category")
+        ciks = df["Insider CIK"] if "Insider CIK" in df.columns else pd.Series(pd.NA, index=df.index, dtype="Int64")
+        pairs = pd.DataFrame({"CIK": ciks.to_numpy(dtype=float, na_value=np.nan), "Name": names.cat.codes.to_numpy()})
+        pair_codes, unique_pairs = pd.MultiIndex.from_frame(pairs).factorize()
+        pair_names = [normalize_name(names.cat.categories[code]) if code >= 0 else "" for _, code in unique_pairs]
+        name_ciks: Dict[str, set] = {}
+        for (cik, _), name in zip(unique_pairs, pair_names):
+            if not np.isnan(cik):
+                name_ciks.setdefault(name, set()).add(str(int(cik)))
+        # Trades without a CIK are resolved to the CIK filed under the same normalized name, if there is only one
+        pair_keys = [
+            str(int(cik)) if not np.isnan(cik) else
+            next(iter(name_ciks[name])) if len(name_ciks.get(name, ())) == 1 else name
+            for (cik, _), name in zip(unique_pairs, pair_names)
+        ]
+        key_codes, insider_keys = pd.factorize(np.array(pair_keys, dtype=object))
+        self.insider_ids: np.ndarray = key_codes[pair_codes].astype(np.int32)
+        latest = _latest_rows(self.insider_ids, filing_dates, len(insider_keys))
+        self.insiders = pd.DataFrame({
+            "Insider Key": insider_keys,
+            "Insider CIK": pd.array([int(key) if key.isdigit() else None for key in insider_keys], dtype="Int64"),
+            "Insider Name": names.to_numpy()[latest],
+            "Trades": np.bincount(self.insider_ids, minlength=len(insider_keys)),
+        }).rename_axis("Insider ID")
+
+        tickers = df["Ticker"].astype("category").cat.remove_unused_categories()
+        self.company_ids: np.ndarray = tickers.cat.codes.to_numpy().astype(np.int32)
+        valid = self.company_ids >= 0
+        latest = _latest_rows(self.company_ids[valid], filing_dates[valid], len(tickers.cat.categories))
+        history = pd.DataFrame({
+            "Company ID": self.company_ids[valid],
+            "Company Name": df["Company Name"].astype(object).to_numpy()[valid],
+            "Filing Date": filing_dates[valid],
+        }).dropna().sort_values("Filing Date", ascending=False).drop_duplicates(["Company ID", "Company Name"])
+        self.companies = pd.DataFrame({
+            "Ticker": tickers.cat.categories,
+            "Company Name": df["Company Name"].to_numpy()[valid][latest],
+            "Name History": history.groupby("Company ID")["Company Name"].agg(tuple),
+            "Trades": np.bincount(self.company_ids[valid], minlength=len(tickers.cat.categories)),
+        }).rename_axis("Company ID")
+
+    def insider_ids_of(self, insider_keys: List[str]) -> np.ndarray:
+        ids = pd.Index(self.insiders["Insider Key"]).get_indexer(insider_keys)
+        return ids[ids >= 0]
+
+    def company_ids_of(self, tickers: List[str]) -> np.ndarray:
+        ids = pd.Index(self.companies["Ticker"]).get_indexer(tickers)
+        return ids[ids >= 0]
+
+    def insider_mask(self, insider_keys: List[str]) -> np.ndarray:
+        """Whether each trade was filed by one of `insider_keys`."""
+        return np.isin(self.insider_ids, self.insider_ids_of(insider_keys))
+
+    def company_mask(self, tickers: List[str]) -> np.ndarray:
+        """Whether each trade is in one of the companies of `tickers`."""
+        return np.isin(self.company_ids, self.company_ids_of(tickers))
+
+    @cached_property
+    def insider_labels(self) -> Dict[str, str]:
+        """Display label of each insider key, ordered by name."""
+        insiders = self.insiders[self.insiders["Insider Key"] != ""].sort_values("Insider Name")
+        return dict(zip(insiders["Insider Key"], insiders["Insider Name"].astype(str)))
+
+    @cached_property
+    def company_labels(self) -> Dict[str, str]:
+        """Display label ("Name (TICKER)") of each ticker, ordered by name."""
+        companies = self.companies.dropna(subset=["Company Name"]).sort_values("Company Name")
+        return {ticker: f"{name} ({ticker})" for ticker, name in zip(companies["Ticker"], companies["Company Name"])}
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.rate_limiter import RateLimiter, RATE_LIMITER
+
+
+class Fetcher:
+    """
+    Pooled HTTP client for OpenInsider pages, safe to share between threads, with bounded retries and backoff and
+    conditional requests (ETag/Last-Modified). Every attempt, retries included, is paced by a per-host rate limiter
+    shared with the other clients of the process, which also counts them.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Tuple[float, float] = (5.0, 30.0),
+        max_cached_pages: int = 32,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        self.timeout = timeout
+        self.max_cached_pages = max_cached_pages
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)  # Retried by `get`
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._validated: OrderedDict[str, Tuple[Dict[str, str], bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _conditional_request(self, url: str) -> Tuple[Dict[str, str], bytes | None]:
+        """Conditional headers for `url` and the body they validate, read together so eviction cannot split them."""
+        with self._lock:
+            validators, body = self._validated.get(url, ({}, None))
+        headers = {}
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+        return headers, body
+
+    def _remember(self, url: str, response: requests.Response) -> None:
+        validators = {name: response.headers[name] for name in ("ETag", "Last-Modified") if name in response.headers}
+        if not validators:
+            return
+        with self._lock:
+            self._validated[url] = (validators, response.content)
+            self._validated.move_to_end(url)
+            while len(self._validated) > self.max_cached_pages:
+                self._validated.popitem(last=False)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        GETs `url`, retrying failed connections and `RETRY_STATUSES` with exponential backoff. Each attempt waits for
+        the host's rate limit; a 429 pauses the host for its Retry-After (or the limiter's default pause).
+        """
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.acquire(url)
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff_factor * 2 ** attempt)
+                continue
+            self._record(url, response)
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.retries:
+                return response
+            if response.status_code != 429:
+                time.sleep(self.backoff_factor * 2 ** attempt)
+        return response
+
+    def fetch(self, url: str) -> bytes:
+        """Returns the body of `url`, reusing the previous body if the server reports it unchanged."""
+        headers, cached_body = self._conditional_request(url)
+        response = self.get(url, headers=headers)
+        if response.status_code == 304:
+            if cached_body is not None:
+                with self._lock:
+                    if url in self._validated:
+                        self._validated.move_to_end(url)
+                return cached_body
+            response = self.get(url)  # No body to reuse: fetch it in full
+        response.raise_for_status()
+        self._remember(url, response)
+        return response.content
+
+    def _record(self, url: str, response: requests.Response) -> None:
+        """Counts the bytes and cache hit of a response, and backs off the host if it throttled us."""
+        self.rate_limiter.record(url, bytes=len(response.content), cache_hits=int(response.status_code == 304))
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            self.rate_limiter.throttled(url, float(retry_after) if retry_after.isdigit() else None)
+
+    def close(self) -> None:
+        self.session.close()
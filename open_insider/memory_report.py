@@ -0,0 +1,60 @@
+"""
+Reports the memory taken per trade by the processed trade frame, compared with the original schema
+(object strings, `Title` as lists of strings, unparsed trade dates and float64 numbers).
+
+Usage (from the repository root):
+    python -m open_insider.memory_report --since 2024-01-01
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from open_insider.column_parsers import CATEGORICAL_COLUMNS
+from open_insider.trade_store import TradeStore
+
+
+def original_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """`df` as the original preprocessing represented it, for comparison."""
+    df = df.drop(columns=["Title Mask", "Trade Code", "Insider CIK"], errors="ignore").copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(object)
+    if "Title" in df.columns:
+        df["Title"] = df["Title"].str.split(", ")
+    if "Trade Date" in df.columns:
+        df["Trade Date"] = df["Trade Date"].dt.strftime("%Y-%m-%d")
+    for column in df.select_dtypes(include=np.floating).columns:
+        df[column] = df[column].astype("float64")
+    return df
+
+
+def bytes_per_row(df: pd.DataFrame) -> pd.Series:
+    return df.memory_usage(deep=True, index=False) / max(len(df), 1)
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Bytes per row of each column of `df` before (original schema) and after (compact schema), with totals."""
+    report = pd.DataFrame({"Before": bytes_per_row(original_schema(df)), "After": bytes_per_row(df)}).reindex(df.columns)
+    report.loc["Total"] = report.sum()
+    return report.round(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report the memory taken per trade by the stored trade frame.")
+    parser.add_argument("--since", default=None, help="Only include filings since this date (YYYY-MM-DD).")
+    parser.add_argument("--store", default=None, help="Trade store directory; defaults to the app's store.")
+    args = parser.parse_args()
+    store = TradeStore(args.store) if args.store else TradeStore()
+    df = store.read(since=pd.Timestamp(args.since) if args.since else None)
+    if df.empty:
+        print("The trade store is empty; run `python -m open_insider.backfill` first.")
+        return
+    report = memory_report(df)
+    print(f"{len(df):,} trades\n")
+    print(report.fillna("-").to_string())
+    before, after = report.loc["Total"]
+    print(f"\n{before / after:.1f}x smaller; 1M trades take {after:.0f} MB (vs. {before:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
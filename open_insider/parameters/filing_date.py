@@ -0,0 +1,40 @@
+from typing import Optional, Tuple
+from datetime import date, datetime
+import pandas as pd
+
+
+class FilingDateParams:
+
+    @staticmethod
+    def _validate_single(param_name: str, param_value: str | date | None) -> date | None:
+        if param_value is None:
+            return None
+        if not isinstance(param_value, (str, date)):
+            raise TypeError(f"{param_value}: `{param_name}` must be a date, datetime, date string, or None.")
+        try:
+            return pd.Timestamp(param_value).date()
+        except ValueError as error:
+            raise ValueError(f"{param_value}: `{param_name}` could not be parsed as a date.") from error
+
+    @classmethod
+    def validate(
+        cls,
+        filing_date_min: Optional[str | date] = None,
+        filing_date_max: Optional[str | date] = None
+    ) -> Tuple[date | None, date | None]:
+        filing_date_min = cls._validate_single('filing_date_min', filing_date_min)
+        filing_date_max = cls._validate_single('filing_date_max', filing_date_max)
+        if filing_date_min is not None and filing_date_max is not None and filing_date_min > filing_date_max:
+            raise ValueError(f"{filing_date_min} > {filing_date_max}: `filing_date_min` must not exceed `filing_date_max`.")
+        return filing_date_min, filing_date_max
+
+    @staticmethod
+    def to_url_params(
+        filing_date_min: Optional[date] = None,
+        filing_date_max: Optional[date] = None
+    ) -> str:
+        if filing_date_min is None and filing_date_max is None:
+            return ""
+        filing_date_min = filing_date_min or date(1990, 1, 1)
+        filing_date_max = filing_date_max or datetime.today().date()
+        return f"fdr={filing_date_min:%m%%2F%d%%2F%Y}+-+{filing_date_max:%m%%2F%d%%2F%Y}"
@@ -1,3 +1,4 @@
+import re
 from typing import List, Union, Optional
 
 from open_insider.parameters.validate import validate_list_str_param
@@ -18,6 +19,19 @@ class JobTitlesParam:
         "Other": ("Other", "isother"),
     }
 
+    # Patterns matching the abbreviated titles OpenInsider prints in the `Title` column (e.g. "Pres, CEO", "Dir", "10%")
+    TITLE_PATTERNS = {
+        "COB": re.compile(r"\bCOB\b|Chairman", re.IGNORECASE),
+        "CEO": re.compile(r"CEO|Chief Executive", re.IGNORECASE),
+        "Pres": re.compile(r"\bPres\b|President", re.IGNORECASE),
+        "COO": re.compile(r"COO\b|Chief Operating", re.IGNORECASE),
+        "CFO": re.compile(r"CFO|Chief Financial", re.IGNORECASE),
+        "GC": re.compile(r"\bGC\b|General Counsel", re.IGNORECASE),
+        "VP": re.compile(r"VP\b|Vice President", re.IGNORECASE),
+        "Director": re.compile(r"\bDir\b|Director", re.IGNORECASE),
+        "10% Owner": re.compile(r"10%"),
+    }
+
     @classmethod
     def validate(cls, job_titles: Optional[Union[str, List[str]]] = None) -> List[str]:
         return validate_list_str_param(
@@ -26,10 +40,31 @@ class JobTitlesParam:
             options=list(cls.JOB_TITLE_MAP.keys()),
         )
 
+    @classmethod
+    def parse_title(cls, title: Union[str, List[str]] | None) -> List[str]:
+        """Maps a raw OpenInsider title (or its comma-split parts) onto `JOB_TITLE_MAP` keys."""
+        if not title or not isinstance(title, (str, list, tuple)):
+            return ["Other"]
+        parts = title.split(", ") if isinstance(title, str) else title
+        job_titles = set()
+        for part in parts:
+            matched = [jt for jt, pattern in cls.TITLE_PATTERNS.items() if pattern.search(part)]
+            job_titles.update(matched or ["Other"])
+        return [jt for jt in cls.JOB_TITLE_MAP if jt in job_titles]
+
+    @classmethod
+    def to_mask(cls, job_titles: List[str]) -> int:
+        """Bitmask with bit `i` set for the `i`-th `JOB_TITLE_MAP` key in `job_titles`."""
+        return sum(1 << i for i, jt in enumerate(cls.JOB_TITLE_MAP) if jt in job_titles)
+
+    @classmethod
+    def is_all(cls, job_titles: List[str] | None) -> bool:
+        return job_titles is None or set(job_titles) >= set(cls.JOB_TITLE_MAP.keys())
+
     @classmethod
     def to_url_params(cls, job_titles: List[str] | None) -> str:
         if job_titles is None:
             job_titles = []
         elif isinstance(job_titles, str):
             job_titles = [job_titles]
-        return "&".join([f"{cls.JOB_TITLE_MAP[jt][1]}=1" for jt in job_titles])
\ No newline at end of file
+        return "&".join([f"{cls.JOB_TITLE_MAP[jt][1]}=1" for jt in job_titles])
@@ -0,0 +1,13 @@
+class PageParam:
+
+    @staticmethod
+    def validate(page: int) -> int:
+        if not isinstance(page, int) or isinstance(page, bool):
+            raise TypeError(f"{page}: `page` must be an integer.")
+        if page < 1:
+            raise ValueError(f"{page}: `page` must be a positive integer.")
+        return page
+
+    @staticmethod
+    def to_url_params(page: int = 1) -> str:
+        return f"page={page}" if page > 1 else ""
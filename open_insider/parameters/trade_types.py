@@ -25,3 +25,8 @@ class TradeTypesParam:
             param_value=trade_types,
             options=list(cls.trade_types.keys()) 
         )
+
+    @classmethod
+    def to_codes(cls, trade_types: List[str]) -> List[int]:
+        """Positions of `trade_types` in `trade_types`, i.e. their categorical codes in the `Trade Code` column."""
+        return [list(cls.trade_types).index(tt) for tt in trade_types]
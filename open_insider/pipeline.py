@@ -0,0 +1,141 @@
+"""
+Runs the app's data pipeline without the app: scrape -> preprocess -> filter -> aggregate -> write.
+
+Usage (from the repository root):
+    python -m open_insider.pipeline --trade-types P --job-titles CEO CFO --num-results 5000 \
+        --groupby Month --groupby Company --aggregation Total --aggregation "Cluster Buys" \
+        --output-dir output --format parquet
+
+Writes the filtered trades to `trades.<format>` and each groupby/aggregation pair to
+`<groupby>_<aggregation>.<format>` in the output directory. Streamlit is never imported.
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional, Dict
+import pandas as pd
+import requests
+
+from open_insider.aggregate import AGGREGATIONS, apply_gb_and_agg
+from open_insider.query_agent import QueryAgent
+from open_insider.rollup import ROLLUP_GRAINS
+from open_insider.trade_index import filter_entities
+from open_insider.trade_store import TradeStore
+from utils.instrumentation import span
+from utils.time_buckets import is_time_bucket
+
+
+OUTPUT_FORMATS = ["parquet", "csv"]
+
+logger = logging.getLogger(__name__)
+
+
+def file_stem(*names: str) -> str:
+    """File name of an output, e.g. ("Month", "Cluster Buys") -> "month_cluster_buys"."""
+    return "_".join("_".join(name.lower().split()) for name in names)
+
+
+def write_frame(df: pd.DataFrame, path: str, output_format: str) -> None:
+    with span("write", format=output_format):
+        if output_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+
+
+def run_pipeline(
+    output_dir: str,
+    groupbys: List[str],
+    aggregations: List[str],
+    trade_types: Optional[List[str]] = ["P", "S"],
+    job_titles: Optional[List[str]] = None,
+    trade_val_min: Optional[int] = None,
+    trade_val_max: Optional[int] = None,
+    num_results: int = 1000,
+    tickers: Optional[List[str]] = None,
+    insider_keys: Optional[List[str]] = None,
+    split_trade_types: bool = False,
+    output_format: str = "parquet",
+    store: Optional[TradeStore] = None,
+) -> Dict[str, str]:
+    """
+    Scrapes, filters and aggregates trades as the app does, and writes the results; returns the path of each output.
+    Raises if the scrape fails, without writing anything.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"{output_format}: Invalid output format; choose from {OUTPUT_FORMATS}")
+    for groupby in groupbys:
+        if groupby not in ROLLUP_GRAINS and not is_time_bucket(groupby):
+            raise ValueError(f"{groupby}: Invalid value for groupby; choose from {ROLLUP_GRAINS} or \"N Days\"")
+    for aggregation in aggregations:
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"{aggregation}: Invalid value for aggregation; choose from {list(AGGREGATIONS.keys())}")
+
+    query_agent = QueryAgent(remember=False, store=store)
+    df = query_agent.scrape(
+        trade_types=trade_types,
+        job_titles=job_titles,
+        trade_val_min=trade_val_min,
+        trade_val_max=trade_val_max,
+        num_results=num_results,
+        raise_errors=True,  # A failed scrape must not be written out as "no trades"
+    )
+    df = filter_entities(df, tickers=tickers, insider_keys=insider_keys)
+    logger.info(f"{len(df)} trades after filtering")
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {"trades": os.path.join(output_dir, f"trades.{output_format}")}
+    write_frame(df, outputs["trades"], output_format)
+    if df.empty:
+        logger.info("No trades to aggregate")
+        return outputs
+    for groupby in groupbys:
+        for aggregation in aggregations:
+            df_agg, _ = apply_gb_and_agg(groupby, aggregation, df, split_trade_types=split_trade_types)
+            stem = file_stem(groupby, aggregation)
+            outputs[stem] = os.path.join(output_dir, f"{stem}.{output_format}")
+            write_frame(df_agg, outputs[stem], output_format)
+    logger.info(f"Wrote {len(outputs)} files to {output_dir}")
+    return outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scrape, filter and aggregate OpenInsider trades, and write the results.")
+    parser.add_argument("--trade-types", nargs="+", default=["P", "S"], help="Trade types, e.g. P S.")
+    parser.add_argument("--job-titles", nargs="+", default=None, help="Insider job titles, e.g. CEO CFO.")
+    parser.add_argument("--trade-val-min", type=int, default=None, help="Minimum trade value ($).")
+    parser.add_argument("--trade-val-max", type=int, default=None, help="Maximum trade value ($).")
+    parser.add_argument("--num-results", type=int, default=1000, help="Number of screener results to scrape.")
+    parser.add_argument("--companies", nargs="+", default=None, help="Only keep trades of these tickers.")
+    parser.add_argument("--insiders", nargs="+", default=None, help="Only keep trades of these insider CIKs or names.")
+    parser.add_argument("--groupby", action="append", default=None, help="Company, a time bucket or \"N Days\"; repeatable.")
+    parser.add_argument("--aggregation", action="append", default=None, help=f"One of {list(AGGREGATIONS)}; repeatable.")
+    parser.add_argument("--split-trade-types", action="store_true", help="Aggregate each trade type separately.")
+    parser.add_argument("--output-dir", default="output", help="Directory the results are written to.")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="parquet", help="Output file format.")
+    parser.add_argument("--store", default=None, help="Trade store directory; defaults to the app's store.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    try:
+        run_pipeline(
+            output_dir=args.output_dir,
+            groupbys=args.groupby or ["Day"],
+            aggregations=args.aggregation or ["Total"],
+            trade_types=args.trade_types,
+            job_titles=args.job_titles,
+            trade_val_min=args.trade_val_min,
+            trade_val_max=args.trade_val_max,
+            num_results=args.num_results,
+            tickers=args.companies,
+            insider_keys=args.insiders,
+            split_trade_types=args.split_trade_types,
+            output_format=args.format,
+            store=TradeStore(args.store) if args.store else TradeStore(),
+        )
+    except requests.RequestException as e:
+        sys.exit(f"Scraping OpenInsider failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 from typing import List, Union, Optional, Dict, Any
+from datetime import date
 
 from open_insider.url_builder import URLBuilder
 from open_insider.parameters.job_titles import JobTitlesParam
 from open_insider.parameters.trade_value import TradeValueParams
 from open_insider.parameters.num_results import NumResultsParam
+from open_insider.parameters.filing_date import FilingDateParams
+from open_insider.parameters.page import PageParam
 
 
 class Query:
@@ -14,10 +17,15 @@ class Query:
         trade_val_min: Optional[int] = None,
         trade_val_max: Optional[int] = None,
         num_results: int = 1000,
+        filing_date_min: Optional[Union[str, date]] = None,
+        filing_date_max: Optional[Union[str, date]] = None,
+        page: int = 1,
     ):
         self.job_titles = JobTitlesParam.validate(job_titles)
         self.trade_val_min, self.trade_val_max = TradeValueParams.validate(trade_val_min, trade_val_max)
         self.num_results = NumResultsParam.validate(num_results)
+        self.filing_date_min, self.filing_date_max = FilingDateParams.validate(filing_date_min, filing_date_max)
+        self.page = PageParam.validate(page)
         
     @property
     def params(self) -> str:
@@ -26,6 +34,9 @@ class Query:
             trade_val_min=self.trade_val_min,
             trade_val_max=self.trade_val_max,
             num_results=self.num_results,
+            filing_date_min=self.filing_date_min,
+            filing_date_max=self.filing_date_max,
+            page=self.page,
         )
 
     def describe(self) -> Dict[str, Any]:
@@ -33,4 +44,4 @@ class Query:
 
     @property
     def url(self) -> str:
-        return URLBuilder(**self.params).build()
\ No newline at end of file
+        return URLBuilder(**self.params).build()
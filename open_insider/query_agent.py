@@ -1,57 +1,188 @@
+import logging
 import time
-from typing import Dict, Any, List, Union, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Union, Optional, Tuple
 import pandas as pd
 import numpy as np
 
 from open_insider.query import Query
+from open_insider.query_predicate import QueryPredicate
+from open_insider.fetcher import Fetcher
+from open_insider.screener_parser import parse_screener_table
+from open_insider.column_parsers import title_mask_column, trade_code_column, restore_dtypes
+from open_insider.trade_store import TradeStore
 from open_insider.parameters.trade_types import TradeTypesParam
+from utils.instrumentation import span, count
+from utils.single_flight import SingleFlight
 
 
-def get_current_time() -> str:
-    return time.strftime('%Y-%m-%d %H:%M:%S')
+logger = logging.getLogger(__name__)
 
 
 class QueryAgent:
 
-    def __init__(self, remember: Union[bool, int] = True, max_rows: int = 5000) -> None:
+    in_flight: SingleFlight[pd.DataFrame] = SingleFlight()  # Screener fetches in progress, by URL
+
+    def __init__(
+        self,
+        remember: Union[bool, int] = True,
+        max_rows: int = 5000,
+        store: Optional[TradeStore] = None,
+        fetcher: Optional[Fetcher] = None,
+    ) -> None:
         self.remember = int(np.abs(remember)) if isinstance(remember, (int, float)) else remember
         self.max_rows = max_rows
-        self.data = []
-        print(f"[{get_current_time()}] QueryAgent initialized with max_rows={max_rows}")
+        self.store = store
+        self.fetcher = fetcher or Fetcher()
+        self.data = []  # (params, frame) of remembered queries, oldest first; replaced, not mutated, under `_lock`
+        self._lock = threading.Lock()
+        logger.debug(f"QueryAgent initialized with max_rows={max_rows}")
 
     def remember_data(self, params: Dict[str, Any], df: pd.DataFrame) -> None:
         if self.remember:
-            self.data.append((params, df))  # Store the scraped data
-            if isinstance(self.remember, int):
-                self.data = self.data[-self.remember:]
+            with self._lock:
+                data = self.data + [(params, df)]  # Store the scraped data
+                self.data = data[-self.remember:] if isinstance(self.remember, int) else data
 
-    def get_existing_data(
-        self,
-        job_titles: Optional[Union[str, List[str]]] = None,
-        trade_val_min: Optional[int] = None,
-        trade_val_max: Optional[int] = None,
-    ) -> None | pd.DataFrame:
-        """Returns cached data if the current query is fully contained in an existing dataset."""
-        job_titles = job_titles or []  # Ensure job_titles is a list
-        print(f"[{get_current_time()}] Checking cache for job_titles={job_titles}, "
-              f"trade_val_min={trade_val_min}, trade_val_max={trade_val_max}")
-        for params, df in self.data:
-            params: Dict[str, Any]
-            prev_job_titles = set(params.get("job_titles") or [])
-            prev_trade_val_min = params.get("trade_val_min") or float('-inf')
-            prev_trade_val_max = params.get("trade_val_max") or float('inf')
-            prev_num_results = params.get("num_results") or 0
-            if (
-                prev_job_titles == set(job_titles) and
-                prev_trade_val_min <= (trade_val_min or float('-inf')) and
-                prev_trade_val_max >= (trade_val_max or float('inf')) and
-                prev_num_results < self.max_rows
-            ):
-                print(f"[{get_current_time()}] Cache hit! Reusing existing data.")
-                return df  # Safe to reuse the cached data
-        print(f"[{get_current_time()}] Cache miss. No suitable cached data found.")
+    def get_existing_data(self, predicate: QueryPredicate) -> None | pd.DataFrame:
+        """Returns cached data if the current query can be answered by filtering an existing dataset."""
+        logger.debug(f"Checking cache for {predicate.describe()}")
+        with self._lock:
+            data = self.data
+        for params, df in reversed(data):
+            answer = self.answer_from(predicate, params, df)
+            if answer is not None:
+                logger.info("Cache hit! Reusing existing data.")
+                count("cache_hits", cache="query")
+                return answer
+        logger.info("Cache miss. No suitable cached data found.")
+        count("cache_misses", cache="query")
         return None
 
+    @staticmethod
+    def answer_from(predicate: QueryPredicate, params: Dict[str, Any], df: pd.DataFrame) -> None | pd.DataFrame:
+        """Answers `predicate` from `df`, the results of the query of `params`, or returns None if it cannot."""
+        cached_predicate = QueryPredicate.from_params(params)
+        if df.empty or not cached_predicate.contains(predicate):
+            return None
+        if (
+            cached_predicate.server_filters() == predicate.server_filters() and
+            predicate.num_results is not None and predicate.num_results <= cached_predicate.num_results
+        ):
+            return df.head(predicate.num_results)  # The same query, or its latest rows
+        # A dataset holding fewer rows than requested is complete; otherwise only filings from its oldest one on are
+        complete_after = None if len(df) < cached_predicate.num_results else df["Filing Date"].min()
+        return predicate.answer(df, complete_after=complete_after)
+
+    @staticmethod
+    def merge_trades(df_new: pd.DataFrame, df_existing: pd.DataFrame) -> pd.DataFrame:
+        """Merges newly fetched trades into an existing dataset, dropping trades already held."""
+        if df_new.empty:
+            return df_existing
+        df = pd.concat([df_new, df_existing], ignore_index=True)
+        df = df[~TradeStore.trade_keys(df).duplicated().values]
+        df = restore_dtypes(df)
+        return df.sort_values("Filing Date", ascending=False, kind="stable", ignore_index=True)
+
+    def fetch_delta(
+        self,
+        query: Query,
+        df_existing: pd.DataFrame,
+        max_pages: int = 10,
+    ) -> Tuple[pd.DataFrame, bool]:
+        """
+        Fetches the trades matching `query` filed since the latest filing in `df_existing`.
+
+        Pages through the screener newest-first and stops at the first page containing an already-held trade.
+        Returns the unseen trades and whether the delta is complete (False if `max_pages` ran out first).
+        """
+        latest_filing_date = df_existing["Filing Date"].max()
+        held_keys = TradeStore.trade_keys(
+            df_existing[df_existing["Filing Date"] >= latest_filing_date.normalize()]
+        )
+        new_pages = []
+        for page in range(1, max_pages + 1):
+            page_query = Query(**{**query.params, "filing_date_min": latest_filing_date.date(), "page": page})
+            df_page = self.fetch(page_query)
+            is_held = TradeStore.trade_keys(df_page).isin(held_keys).values if not df_page.empty else np.array([])
+            new_pages.append(df_page[~is_held])
+            if is_held.any() or len(df_page) < page_query.num_results:
+                break
+        else:
+            logger.warning(f"Delta fetch stopped after {max_pages} pages before reaching held trades")
+            return pd.concat(new_pages, ignore_index=True), False
+        df_new = pd.concat(new_pages, ignore_index=True)
+        logger.info(f"Delta fetch found {len(df_new)} new trades in {len(new_pages)} page(s)")
+        return df_new, True
+
+    def refresh_cached_data(self, predicate: Optional[QueryPredicate] = None) -> None:
+        """
+        Brings the remembered datasets (only those containing `predicate`, if given) up to date with an incremental
+        delta fetch.
+        """
+        with self._lock:
+            data = self.data
+        refreshed: Dict[int, Optional[Tuple[Dict[str, Any], pd.DataFrame]]] = {}
+        for params, df in data:
+            if predicate is not None and not QueryPredicate.from_params(params).contains(predicate):
+                continue
+            query = Query(**params)
+            refreshed[id(df)] = None
+            if df.empty:
+                continue
+            df_new, complete = self.fetch_delta(query, df)
+            if complete:  # An incomplete delta would leave a gap, so the dataset is dropped instead
+                refreshed[id(df)] = (params, self.merge_trades(df_new, df).head(query.num_results))
+        with self._lock:  # Datasets remembered during the refresh are kept as they are
+            self.data = [
+                refreshed[id(df)] if id(df) in refreshed else (params, df)
+                for params, df in self.data if refreshed.get(id(df), True) is not None
+            ]
+
+    def refresh_store(self) -> None:
+        """Fetches filings newer than the latest stored filing date into the store, at most once per store TTL."""
+        if self.store is None or not self.store.is_stale():
+            return
+        query = Query(num_results=self.max_rows)
+        latest_filing_date = self.store.latest_filing_date()
+        covered_since = self.store.covered_since
+        logger.info(f"Refreshing trade store with filings since {latest_filing_date}")
+        if latest_filing_date is None or covered_since is None:
+            df = self.fetch(query)
+            complete = False
+        else:
+            df, complete = self.fetch_delta(query, self.store.read(since=latest_filing_date.normalize()))
+        num_new = self.store.write(df)
+        if not complete and not df.empty:
+            # First fill, or a delta cut short: only the fetched window is known to hold every filing
+            covered_since = df["Filing Date"].min()
+        self.store.update_meta(
+            covered_since=str(covered_since) if covered_since is not None else None,
+            last_refresh=time.time(),
+        )
+        logger.info(f"Trade store refreshed with {num_new} new trades")
+
+    def get_stored_data(self, predicate: QueryPredicate) -> None | pd.DataFrame:
+        """Answers `query` from the local trade store when its covered window holds enough matching trades."""
+        if self.store is None:
+            return None
+        try:
+            self.refresh_store()
+        except Exception as e:
+            logger.warning(f"Error refreshing trade store, serving stored data: {e}")
+        covered_since = self.store.covered_since
+        if covered_since is None:
+            return None
+        df = predicate.answer(self.store.read(since=covered_since), complete_after=covered_since)
+        if df is None:
+            logger.info(f"Store miss. Not enough trades stored since {covered_since}.")
+            count("cache_misses", cache="store")
+            return None
+        logger.info(f"Store hit! Reading {len(df)} trades from local store.")
+        count("cache_hits", cache="store")
+        return df.reset_index(drop=True)
+
     @staticmethod
     def filter_df(
         df: pd.DataFrame,
@@ -59,34 +190,73 @@ class QueryAgent:
         trade_val_min: Optional[int] = None,
         trade_val_max: Optional[int] = None,
     ) -> pd.DataFrame:
-        """Filters the dataframe based on the given parameters."""
-        print(f"[{get_current_time()}] Filtering DataFrame with trade_types={trade_types}, "
-              f"trade_val_min={trade_val_min}, trade_val_max={trade_val_max}")
-        if trade_types:
-            trade_types = TradeTypesParam.validate(trade_types)
-            df = df[df["Trade Type"].apply(lambda tt: tt.split(' - ')[0]).isin(trade_types)]
-        if trade_val_min is not None:
-            df = df[df["Value"] >= trade_val_min]
-        if trade_val_max is not None:
-            df = df[df["Value"] <= trade_val_max]
-        print(f"[{get_current_time()}] Filtering complete. Resulting DataFrame shape: {df.shape}")
+        """Filters the dataframe based on the given parameters, combining all predicates into one boolean mask."""
+        logger.debug(f"Filtering DataFrame with trade_types={trade_types}, "
+                     f"trade_val_min={trade_val_min}, trade_val_max={trade_val_max}")
+        if df.empty:
+            return df
+        with span("filter"):
+            mask = np.ones(len(df), dtype=bool)
+            if trade_types:
+                trade_types = TradeTypesParam.validate(trade_types)
+                mask &= np.isin(df["Trade Code"].cat.codes.values, TradeTypesParam.to_codes(trade_types))
+            if trade_val_min is not None:
+                mask &= df["Value"].values >= trade_val_min
+            if trade_val_max is not None:
+                mask &= df["Value"].values <= trade_val_max
+            if not mask.all():
+                df = df[mask]
+        logger.debug(f"Filtering complete. Resulting DataFrame shape: {df.shape}")
         return df
 
     @staticmethod
     def preprocess_data(
         df: pd.DataFrame,
     ) -> pd.DataFrame:
+        """Shapes the typed columns emitted by `parse_screener_table` and adds the job-title bitmask and trade code."""
         df.columns = df.columns.str.replace("\xa0", " ")
-        df.drop(columns=["1d", "1w", "1m", "6m"], inplace=True)
+        df.drop(columns=["1d", "1w", "1m", "6m"], inplace=True, errors="ignore")
         df.rename(columns={"X": "Filing Type", "Qty": "Quantity"}, inplace=True)
-        df["Filing Type"] = df["Filing Type"].astype("category")
-        df["Quantity"] = df["Quantity"].astype(int)
-        df["Filing Date"] = pd.to_datetime(df["Filing Date"])
-        df["Price"] = df["Price"].str.replace(r'[\$,+]', '', regex=True).astype(float)
-        df["Value"] = df["Value"].str.replace(r'[\$,+]', '', regex=True).astype(float)
-        df["Owned"] = df["Owned"].astype(int)
-        df["ΔOwn"] = df["ΔOwn"].replace("New", np.nan).str.replace(r'[\$,+%>]', '', regex=True).astype(float) / 100
-        df["Title"] = df["Title"].str.split(", ")
+        df["Title Mask"] = title_mask_column(df["Title"])
+        df["Trade Code"] = trade_code_column(df["Trade Type"])
+        return df
+
+    def fetch(self, query: Query) -> pd.DataFrame:
+        """Scrapes and preprocesses the screener results for `query` from OpenInsider."""
+        return self.fetch_many([query])[0]
+
+    def fetch_many(self, queries: List[Query]) -> List[pd.DataFrame]:
+        """Scrapes and preprocesses the screener results for several queries concurrently."""
+        logger.info(f"Scraping new data with {len(queries)} quer{'y' if len(queries) == 1 else 'ies'}")
+        for query in queries:
+            logger.info(f"{query.describe()} ({query.url})")
+        with span("scrape", queries=len(queries)):
+            if len(queries) <= 1:
+                dfs = [self.fetch_shared(query) for query in queries]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.fetcher.max_workers, len(queries))) as executor:
+                    dfs = list(executor.map(self.fetch_shared, queries))
+        logger.info("Scraping successfully completed")
+        return dfs
+
+    def fetch_and_parse(self, query: Query) -> pd.DataFrame:
+        with span("fetch"):
+            page = self.fetcher.fetch(query.url)
+        with span("parse"):
+            df = parse_screener_table(page)
+        with span("preprocess"):
+            return self.preprocess_data(df)
+
+    def fetch_shared(self, query: Query) -> pd.DataFrame:
+        """
+        Scrapes and preprocesses the screener page of `query`, sharing one fetch among concurrent callers (e.g. the
+        sessions of several users applying the same filters at once) across every agent of the process.
+        """
+        df, shared = self.in_flight.do(query.url, lambda: self.fetch_and_parse(query))
+        if shared:
+            logger.info(f"Shared an in-flight fetch of {query.url}")
+            count("shared_fetches")
+            return df.copy(deep=False)  # Columns added or replaced by one caller are not seen by the others
         return df
 
     def scrape(
@@ -95,43 +265,48 @@ class QueryAgent:
         job_titles: Optional[Union[str, List[str]]] = None,
         trade_val_min: Optional[int] = None,
         trade_val_max: Optional[int] = None,
-        num_results: int = 1000
+        num_results: int = 1000,
+        incremental: bool = False,
+        raise_errors: bool = False,
     ) -> pd.DataFrame:
-        """Executes a query by scraping OpenInsider, reusing cached data when possible."""
-        print(f"\n[{get_current_time()}] Initiating scrape request with parameters:")
-        print(f"\tTrade Types: {trade_types}")
-        print(f"\tJob Titles: {job_titles}")
-        print(f"\tTrade Volume Min: {trade_val_min}")
-        print(f"\tTrade Volume Max: {trade_val_max}")
-        print(f"\tNumber of Results: {num_results}\n")
-        existing_data = self.get_existing_data(
+        """
+        Executes a query by scraping OpenInsider, reusing cached data when possible.
+
+        With `incremental=True`, the cached datasets that can answer the query are first brought up to date by
+        fetching only newer filings.
+        A failed scrape returns an empty frame, or with `raise_errors=True` raises, so that callers can tell it
+        apart from a query no trades match.
+        """
+        logger.info(f"Initiating scrape request with trade_types={trade_types}, job_titles={job_titles}, "
+                    f"trade_val_min={trade_val_min}, trade_val_max={trade_val_max}, num_results={num_results}")
+        query = Query(
             job_titles=job_titles,
             trade_val_min=trade_val_min,
             trade_val_max=trade_val_max,
+            num_results=num_results,
         )
-        if existing_data is None:
-            query = Query(
-                job_titles=job_titles,
-                trade_val_min=trade_val_min,
-                trade_val_max=trade_val_max,
-                num_results=num_results,
-            )
-            start_time = time.time()
-            print(f"[{get_current_time()}] Scraping new data with query:\n")
-            print(f"\t{query.describe()}")
-            print(f"\tURL: {query.url}\n")
+        predicate = QueryPredicate.from_query(query, trade_types=trade_types)
+        if incremental:  # A refreshed dataset answers the query below, so only the delta is fetched
             try:
-                df = pd.read_html(query.url)[11]  # Fetch the 11th table from the webpage
-                print(f"[{get_current_time()}] Scraping successfully completed in {time.time() - start_time:.2f} seconds")
+                self.refresh_cached_data(predicate)
             except Exception as e:
-                print(f"[{get_current_time()}] Error during scraping: {e}")
-                return pd.DataFrame()  # Return empty DataFrame in case of failure
-            df = self.preprocess_data(df)
+                logger.warning(f"Error during incremental refresh, keeping cached data: {e}")
+        existing_data = self.get_existing_data(predicate)
+        if existing_data is None:
+            df = self.get_stored_data(predicate)
+            if df is None:
+                try:
+                    df = self.fetch(query)
+                except Exception as e:
+                    logger.warning(f"Error during scraping: {e}")
+                    if raise_errors:
+                        raise
+                    return pd.DataFrame()  # Return empty DataFrame in case of failure
             if self.remember:
                 self.remember_data(query.params, df)
         else:
             df = existing_data
-            print(f"[{get_current_time()}] Using cached data. No scraping needed.")
+            logger.info("Using cached data. No scraping needed.")
         return self.filter_df(
             df,
             trade_types=trade_types,
@@ -141,6 +316,7 @@ class QueryAgent:
 
     def clear(self) -> None:
         """Clears all cached data."""
-        print(f"[{get_current_time()}] Clearing cached data...")
-        self.data.clear()
-        print(f"[{get_current_time()}] Cache cleared successfully.")
+        logger.debug("Clearing cached data...")
+        with self._lock:
+            self.data = []
+        logger.debug("Cache cleared successfully.")
@@ -0,0 +1,114 @@
+from typing import Dict, Any, List, Union, Optional, Tuple
+from datetime import date
+import pandas as pd
+
+from open_insider.query import Query
+from open_insider.parameters.job_titles import JobTitlesParam
+from open_insider.parameters.trade_types import TradeTypesParam
+
+
+class QueryPredicate:
+    """
+    Row predicate described by a `Query` (plus the trade types filtered client-side), used to decide
+    whether one query's results can be answered by filtering another's.
+
+    The row limit applies before the trade-type filter, as OpenInsider returns the latest `num_results`
+    filings matching the server-side filters and trade types are only filtered afterwards.
+    """
+
+    def __init__(
+        self,
+        job_titles: Optional[Union[str, List[str]]] = None,
+        trade_types: Optional[Union[str, List[str]]] = None,
+        trade_val_min: Optional[int] = None,
+        trade_val_max: Optional[int] = None,
+        filing_date_min: Optional[date] = None,
+        filing_date_max: Optional[date] = None,
+        num_results: Optional[int] = None,
+    ) -> None:
+        job_titles = JobTitlesParam.validate(job_titles)
+        trade_types = TradeTypesParam.validate(trade_types or None)
+        self.job_titles = None if JobTitlesParam.is_all(job_titles) else frozenset(job_titles)
+        self.trade_types = None if set(trade_types) >= set(TradeTypesParam.trade_types) else frozenset(trade_types)
+        self.trade_val_min = trade_val_min
+        self.trade_val_max = trade_val_max
+        self.filing_date_min = pd.Timestamp(filing_date_min) if filing_date_min is not None else None
+        self.filing_date_max = pd.Timestamp(filing_date_max) + pd.Timedelta(days=1) if filing_date_max is not None else None
+        self.num_results = num_results
+
+    @classmethod
+    def from_query(cls, query: Query, trade_types: Optional[Union[str, List[str]]] = None) -> "QueryPredicate":
+        return cls(
+            job_titles=query.job_titles,
+            trade_types=trade_types,
+            trade_val_min=query.trade_val_min,
+            trade_val_max=query.trade_val_max,
+            filing_date_min=query.filing_date_min,
+            filing_date_max=query.filing_date_max,
+            num_results=query.num_results,
+        )
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "QueryPredicate":
+        return cls.from_query(Query(**params))
+
+    def describe(self) -> Dict[str, Any]:
+        return {name: value for name, value in vars(self).items() if value is not None}
+
+    def server_filters(self) -> Tuple:
+        """Filters OpenInsider applies server-side: everything but the trade types and the row limit."""
+        return self.job_titles, self.trade_val_min, self.trade_val_max, self.filing_date_min, self.filing_date_max
+
+    @staticmethod
+    def _contains_set(outer: frozenset | None, inner: frozenset | None) -> bool:
+        return outer is None or (inner is not None and inner <= outer)
+
+    @staticmethod
+    def _contains_bound(outer: Any, inner: Any, lower: bool) -> bool:
+        if outer is None:
+            return True
+        if inner is None:
+            return False
+        return outer <= inner if lower else outer >= inner
+
+    def contains(self, other: "QueryPredicate") -> bool:
+        """Whether every trade matching `other` also matches this predicate (row limits aside)."""
+        return (
+            self._contains_set(self.job_titles, other.job_titles) and
+            self._contains_set(self.trade_types, other.trade_types) and
+            self._contains_bound(self.trade_val_min, other.trade_val_min, lower=True) and
+            self._contains_bound(self.trade_val_max, other.trade_val_max, lower=False) and
+            self._contains_bound(self.filing_date_min, other.filing_date_min, lower=True) and
+            self._contains_bound(self.filing_date_max, other.filing_date_max, lower=False)
+        )
+
+    def mask(self, df: pd.DataFrame, include_trade_types: bool = True) -> pd.Series:
+        mask = pd.Series(True, index=df.index)
+        if self.job_titles is not None:
+            mask &= (df["Title Mask"] & JobTitlesParam.to_mask(self.job_titles)) != 0
+        if include_trade_types and self.trade_types is not None:
+            mask &= df["Trade Code"].isin(self.trade_types)
+        if self.trade_val_min is not None:
+            mask &= df["Value"].abs() >= self.trade_val_min
+        if self.trade_val_max is not None:
+            mask &= df["Value"].abs() <= self.trade_val_max
+        if self.filing_date_min is not None:
+            mask &= df["Filing Date"] >= self.filing_date_min
+        if self.filing_date_max is not None:
+            mask &= df["Filing Date"] < self.filing_date_max
+        return mask
+
+    def answer(self, df: pd.DataFrame, complete_after: Optional[pd.Timestamp] = None) -> None | pd.DataFrame:
+        """
+        Answers this predicate's row-limited results (before the trade-type filter) from `df`, the results of a
+        containing predicate. `df` must hold every matching trade filed after `complete_after` and some of those
+        filed at it (the server orders trades filed at the same time arbitrarily, so any of them make a correct
+        answer), or every matching trade at all if `complete_after` is None. Returns None if `df` cannot answer.
+        """
+        df = df[self.mask(df, include_trade_types=False)].sort_values("Filing Date", ascending=False, kind="stable")
+        if complete_after is not None:
+            df = df[df["Filing Date"] >= complete_after]
+            window_is_complete = self.filing_date_min is not None and self.filing_date_min > complete_after
+            if not window_is_complete and (self.num_results is None or len(df) < self.num_results):
+                return None
+        return df.head(self.num_results) if self.num_results is not None else df
@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from open_insider.parameters.job_titles import JobTitlesParam
+from open_insider.parameters.trade_types import TradeTypesParam
+from open_insider.signals import NET_WINDOW_DAYS, compute_signals, window_sums
+from utils.dataset_cache import DatasetCache
+from utils.time_buckets import TIME_BUCKETS, MISSING_CODE, day_codes, bucket_codes, bucket_labels, group_sums
+
+
+ROLLUP_GRAINS = ["Company"] + TIME_BUCKETS  # Precomputed; other time buckets (e.g. "14 Days") are rolled up on request
+ROLLUP_MEASURES = [
+    "Total",  # sum(|Value|)
+    "Count",
+    "Value Count",  # Trades with a Value, for the mean
+    "Net Value",  # Purchases minus sales
+    "Recent Net Value",  # Net Value of the last `NET_WINDOW_DAYS` days of the dataset
+    "Cluster Buys",
+    "First Buys",
+]
+
+
+class RollupCube:
+    """
+    Sums of |Value| and trade counts of a dataset by company and by day, crossed with trade type (`Trade Code`)
+    and title (`Title Mask`), built once per dataset; coarser time buckets are rolled up from the daily table.
+    Insider-activity signals (see `compute_signals`) are computed with the cube and rolled up with it, and each
+    bucket gets the rolling net purchases of the `NET_WINDOW_DAYS` days ending on its last trade date (for
+    companies, on the dataset's last trade date) as "Rolling Net Value".
+
+    Charts read the precomputed totals of each grain in `ROLLUP_GRAINS`; restricting to trade types or titles,
+    splitting by trade type or custom buckets re-aggregate the (much smaller) crossed tables instead of
+    rescanning the dataset. Means are derived as Total / Value Count.
+    """
+
+    def __init__(self, dataset: pd.DataFrame) -> None:
+        values = dataset["Value"].to_numpy(dtype=float)
+        signals = compute_signals(dataset)
+        days = day_codes(dataset["Trade Date"])
+        dated = days != MISSING_CODE
+        recent = dated & (days > days[dated].max() - NET_WINDOW_DAYS) if dated.any() else dated
+        companies = dataset["Company Name"].astype("category")
+        self.companies = companies.cat.categories
+        measures = pd.DataFrame({
+            "Company": np.where(companies.cat.codes.values < 0, MISSING_CODE, companies.cat.codes.values),
+            "Day": days,
+            "Trade Code": dataset["Trade Code"].cat.codes.values,
+            "Title Mask": dataset["Title Mask"].to_numpy(),
+            "Total": np.abs(values),
+            "Count": 1,
+            "Value Count": ~np.isnan(values),
+            "Net Value": signals["Signed Value"].to_numpy(),
+            "Recent Net Value": signals["Signed Value"].to_numpy() * recent,
+            "Cluster Buys": signals["Cluster Buy"].to_numpy(),
+            "First Buys": signals["First Buy"].to_numpy(),
+        })
+        self.tables: Dict[str, pd.DataFrame] = {
+            dimension: measures.groupby([dimension, "Trade Code", "Title Mask"])[ROLLUP_MEASURES].sum().reset_index()
+            for dimension in ["Company", "Day"]
+        }
+        self.totals: Dict[str, pd.DataFrame] = {grain: self._aggregate(grain) for grain in ROLLUP_GRAINS}
+
+    def _aggregate(
+        self,
+        grain: str,
+        mask: Optional[np.ndarray] = None,
+        split_trade_types: bool = False,
+    ) -> pd.DataFrame:
+        table = self.tables["Company" if grain == "Company" else "Day"]
+        if mask is not None:
+            table = table[mask]
+        codes = table["Company"].to_numpy() if grain == "Company" else bucket_codes(table["Day"].to_numpy(), grain)
+        if split_trade_types:
+            trade_codes = table["Trade Code"].to_numpy()
+            metrics = {
+                (measure, f"{trade_type} - {name}"): table[measure].to_numpy() * (trade_codes == code)
+                for measure in ROLLUP_MEASURES
+                for code, (trade_type, name) in enumerate(TradeTypesParam.trade_types.items())
+                if (trade_codes == code).any()
+            }
+        else:
+            metrics = {measure: table[measure].to_numpy() for measure in ROLLUP_MEASURES}
+        uniques, sums = group_sums(codes, metrics)
+        for key in list(metrics):
+            measure, trade_type = key if split_trade_types else (key, None)
+            if measure != "Net Value":
+                continue
+            rolling_key = ("Rolling Net Value", trade_type) if split_trade_types else "Rolling Net Value"
+            if grain == "Company":
+                sums[rolling_key] = sums[("Recent Net Value", trade_type) if split_trade_types else "Recent Net Value"]
+            else:
+                sums[rolling_key] = self._rolling_sums(table["Day"].to_numpy(), codes, metrics[key], uniques)
+        labels = self.companies[uniques] if grain == "Company" else bucket_labels(uniques, grain)
+        df = pd.DataFrame(sums, index=pd.Index(labels, name=grain))
+        if split_trade_types:
+            df.columns = pd.MultiIndex.from_tuples(df.columns, names=[None, "Trade Type"])
+        return df
+
+    @staticmethod
+    def _rolling_sums(days: np.ndarray, codes: np.ndarray, values: np.ndarray, uniques: np.ndarray) -> np.ndarray:
+        """Sums of `values` over the `NET_WINDOW_DAYS` days ending on the last day of each bucket of `uniques`."""
+        valid = codes != MISSING_CODE
+        days, codes, values = days[valid], codes[valid], np.nan_to_num(np.asarray(values, dtype=float)[valid])
+        last_days = pd.Series(days).groupby(codes).max().reindex(uniques).to_numpy()
+        return window_sums(days, values, NET_WINDOW_DAYS, at=last_days)
+
+    def rollup(
+        self,
+        grain: str,
+        trade_types: Optional[List[str]] = None,
+        job_titles: Optional[List[str]] = None,
+        split_trade_types: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Measures by `grain`, optionally restricted to trades of `trade_types` by insiders with any of `job_titles`.
+        With `split_trade_types`, each measure has one column per trade type, computed in the same pass.
+        """
+        restricted = trade_types is not None or not JobTitlesParam.is_all(job_titles)
+        if grain in self.totals and not restricted and not split_trade_types:
+            return self.totals[grain]
+        mask = None
+        if restricted:
+            table = self.tables["Company" if grain == "Company" else "Day"]
+            mask = np.ones(len(table), dtype=bool)
+            if trade_types is not None:
+                mask &= np.isin(table["Trade Code"].to_numpy(), TradeTypesParam.to_codes(trade_types))
+            if not JobTitlesParam.is_all(job_titles):
+                mask &= (table["Title Mask"].to_numpy() & JobTitlesParam.to_mask(job_titles)) != 0
+        return self._aggregate(grain, mask=mask, split_trade_types=split_trade_types)
+
+
+_CUBES = DatasetCache(RollupCube)
+
+
+def get_rollup_cube(dataset: pd.DataFrame) -> RollupCube:
+    """Cube of `dataset`, built on first use."""
+    return _CUBES.get(dataset)
@@ -0,0 +1,78 @@
+from typing import List, BinaryIO, Union
+import io
+import re
+import urllib.request
+import pandas as pd
+from lxml import etree
+
+from open_insider.column_parsers import parse_columns
+
+
+RESULTS_TABLE_CLASS = "tinytable"
+
+# Columns whose cell links hold an identifier, and the column and href pattern it is extracted with
+LINK_COLUMNS = {
+    "Insider Name": ("Insider CIK", re.compile(r"/insider/[^/]+/(\d+)")),  # e.g. /insider/Cook-Timothy-D/1214156
+}
+
+
+def _is_results_table(element: etree._Element | None) -> bool:
+    return element is not None and RESULTS_TABLE_CLASS in (element.get("class") or "").split()
+
+
+def _parent_table(row: etree._Element) -> etree._Element | None:
+    parent = row.getparent()
+    return parent.getparent() if parent is not None and parent.tag in ("thead", "tbody", "tfoot") else parent
+
+
+def _cell_text(cell: etree._Element) -> str | None:
+    return etree.tostring(cell, method="text", encoding=str, with_tail=False).strip() or None
+
+
+def _cell_link_id(cell: etree._Element, pattern: re.Pattern) -> str | None:
+    link = cell.find(".//a")
+    match = pattern.search(link.get("href") or "") if link is not None else None
+    return match.group(1) if match else None
+
+
+def parse_screener_table(source: Union[str, bytes, BinaryIO]) -> pd.DataFrame:
+    """
+    Streams an OpenInsider screener page and parses only its results table (`<table class="tinytable">`).
+
+    `source` may be a URL, the page's raw bytes, or a binary file-like object. Rows are read as they are
+    parsed and discarded right after; columns are converted to their types by `parse_columns` once the
+    table is assembled. Identifiers linked from the cells of `LINK_COLUMNS` are added as columns.
+    """
+    if isinstance(source, str):
+        with urllib.request.urlopen(source) as response:
+            return parse_screener_table(response)
+    if isinstance(source, bytes):
+        return parse_screener_table(io.BytesIO(source))
+
+    headers: List[str] = []
+    link_columns: List[tuple] = []
+    rows: List[List[str | None]] = []
+    found = False
+    for _, element in etree.iterparse(source, events=("end",), tag=("tr", "table"), html=True):
+        if element.tag == "table":
+            if _is_results_table(element):
+                break
+        elif _is_results_table(_parent_table(element)):
+            found = True
+            cell_elements = [cell for cell in element if cell.tag in ("td", "th")]
+            cells = [_cell_text(cell) for cell in cell_elements]
+            if cells and element[0].tag == "th":
+                headers = [(cell or "").replace("\xa0", " ") for cell in cells]
+                link_columns = [(headers.index(column), pattern) for column, (_, pattern) in LINK_COLUMNS.items() if column in headers]
+                headers += [id_column for column, (id_column, _) in LINK_COLUMNS.items() if column in headers]
+            elif cells:
+                rows.append(cells + [
+                    _cell_link_id(cell_elements[i], pattern) if i < len(cell_elements) else None for i, pattern in link_columns
+                ])
+        element.clear()
+        while element.getprevious() is not None:  # Free rows already read
+            del element.getparent()[0]
+    if not found:
+        raise ValueError(f"OpenInsider results table (`<table class=\"{RESULTS_TABLE_CLASS}\">`) not found in page.")
+
+    return parse_columns(pd.DataFrame(rows, columns=headers))
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from utils.time_buckets import MISSING_CODE, day_codes
+
+
+CLUSTER_MIN_INSIDERS = 3  # Distinct insiders buying the same ticker ...
+CLUSTER_WINDOW_DAYS = 14  # ... within this many days make a cluster buy
+NET_WINDOW_DAYS = 30  # Days of net purchases summed by the rolling net purchases of the rollup cube
+FIRST_BUY_MONTHS = 12
+
+
+def window_sums(keys: np.ndarray, values: np.ndarray, window: int, at: np.ndarray) -> np.ndarray:
+    """Sum of `values` over the entries whose key is in (key - window, key], for each key of `at`."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    cumsums = np.concatenate([[0.0], np.cumsum(values[order])])
+    return cumsums[np.searchsorted(sorted_keys, at, "right")] - cumsums[np.searchsorted(sorted_keys, at - window + 1, "left")]
+
+
+def compute_signals(
+    df: pd.DataFrame,
+    cluster_min_insiders: int = CLUSTER_MIN_INSIDERS,
+    cluster_window_days: int = CLUSTER_WINDOW_DAYS,
+    first_buy_months: int = FIRST_BUY_MONTHS,
+) -> pd.DataFrame:
+    """
+    Insider-activity signals of every trade in a processed trade frame (see `QueryAgent.preprocess_data`),
+    computed for all tickers at once over (ticker, day) keys sorted once; windows end on each trade's date:
+    - Signed Value: |Value| of purchases, -|Value| of sales and 0 otherwise
+    - Cluster Buy: purchase of a ticker bought by at least `cluster_min_insiders` distinct insiders over the last
+      `cluster_window_days` days
+    - First Buy: purchase by an insider who had not bought the ticker in the previous `first_buy_months` months
+    """
+    days = day_codes(df["Trade Date"])
+    tickers = df["Ticker"].astype("category").cat.codes.values.astype(np.int64)
+    insiders = df["Insider Name"].astype("category").cat.codes.values.astype(np.int64)
+    valid = (days != MISSING_CODE) & (tickers >= 0)
+    purchases = (df["Trade Code"] == "P").to_numpy() & valid
+    sales = (df["Trade Code"] == "S").to_numpy() & valid
+    values = np.nan_to_num(np.abs(df["Value"].to_numpy(dtype=float)))
+    signals = pd.DataFrame({
+        "Signed Value": np.where(purchases, values, np.where(sales, -values, 0.0)),
+        "Cluster Buy": False,
+        "First Buy": False,
+    }, index=df.index)
+    if not purchases.any():
+        return signals
+
+    # Composite (ticker, day) keys; the stride leaves room for every window so windows never span two tickers
+    margin = cluster_window_days
+    offset = days[valid].min() - margin
+    days = np.where(valid, days - offset, 0)
+    stride = int(days.max()) + 2 * margin
+    keys = tickers * stride + days
+
+    # Purchase days of each (ticker, insider) pair, in (pair, day) order
+    pairs = tickers[purchases] * (insiders.max() + 2) + insiders[purchases] + 1
+    pair_keys = pairs * stride + days[purchases]
+    event_keys, first_rows = np.unique(pair_keys, return_index=True)
+    event_pairs = pairs[first_rows]
+    event_days = days[purchases][first_rows]
+    event_tickers = tickers[purchases][first_rows]
+    same_pair_next = np.append(event_pairs[1:] == event_pairs[:-1], False)
+    same_pair_prev = np.insert(event_pairs[1:] == event_pairs[:-1], 0, False)
+
+    # A pair counts towards its ticker's cluster size from each purchase day until `cluster_window_days` later,
+    # cut short at its next purchase, so intervals of a pair never overlap and each insider is counted once
+    next_days = np.append(event_days[1:], 0)
+    ends = np.where(same_pair_next, np.minimum(event_days + cluster_window_days, next_days), event_days + cluster_window_days)
+    starts = np.sort(event_tickers * stride + event_days)
+    ends = np.sort(event_tickers * stride + ends)
+    purchase_keys = keys[purchases]
+    cluster_sizes = np.searchsorted(starts, purchase_keys, "right") - np.searchsorted(ends, purchase_keys, "right")
+    signals.loc[purchases, "Cluster Buy"] = cluster_sizes >= cluster_min_insiders
+
+    # First purchase of a pair, or its previous purchase was over `first_buy_months` months earlier
+    event_dates = pd.DatetimeIndex((event_days + offset).astype("datetime64[D]"))
+    lookback_days = day_codes(event_dates - pd.DateOffset(months=first_buy_months)) - offset
+    prev_days = np.insert(event_days[:-1], 0, 0)
+    first_buys = ~same_pair_prev | (prev_days < lookback_days)
+    signals.loc[purchases, "First Buy"] = first_buys[np.searchsorted(event_keys, pair_keys)]
+    return signals
@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from open_insider.dimensions import Dimensions
+from utils.dataset_cache import DatasetCache
+
+
+class ColumnIndex:
+    """Row positions of each key of a column, grouped by a single stable sort of the column's integer codes."""
+
+    def __init__(self, codes: np.ndarray, keys: pd.Index) -> None:
+        self.keys = keys
+        self.order = np.argsort(codes, kind="stable")
+        self.offsets = np.searchsorted(codes[self.order], np.arange(len(keys) + 1))
+
+    @classmethod
+    def from_column(cls, values: pd.Series) -> "ColumnIndex":
+        values = values.astype("category")
+        return cls(values.cat.codes.to_numpy(), values.cat.categories)
+
+    def positions(self, key: str) -> np.ndarray:
+        """Positions (in dataset order) of the rows holding `key`; empty if there are none."""
+        if key not in self.keys:
+            return np.array([], dtype=np.int64)
+        code = self.keys.get_loc(key)
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+
+class TradeIndex:
+    """
+    Lookups into a trade frame, built in one pass over it: its insider and company dimension tables, the rows of
+    each ticker and insider, and the ticker of each company. Holds row positions only (never the frame), so
+    slicing a company's or an insider's trades takes O(their trades).
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.dimensions = Dimensions(df)
+        self.tickers = ColumnIndex.from_column(df["Ticker"])
+        self.insiders = ColumnIndex(self.dimensions.insider_ids, pd.Index(self.dimensions.insiders["Insider Key"]))
+        ticker_codes = df["Ticker"].astype("category").cat.codes.to_numpy()
+        _, first_rows = np.unique(ticker_codes, return_index=True)
+        first_rows = np.sort(first_rows[ticker_codes[first_rows] >= 0])
+        first_rows = first_rows[df["Company Name"].notna().to_numpy()[first_rows]]
+        self.company_tickers: Dict[str, str] = dict(
+            zip(df["Company Name"].to_numpy()[first_rows], df["Ticker"].to_numpy()[first_rows])
+        )
+
+    @property
+    def companies(self) -> List[str]:
+        """Companies in order of their first trade in the dataset."""
+        return list(self.company_tickers)
+
+    def ticker_trades(self, df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+        return df.iloc[self.tickers.positions(ticker)]
+
+    def insider_trades(self, df: pd.DataFrame, insider_key: str) -> pd.DataFrame:
+        """Trades of an insider (by `Dimensions` insider key) across all companies and spellings of their name."""
+        return df.iloc[self.insiders.positions(insider_key)]
+
+
+_INDEXES = DatasetCache(TradeIndex)
+
+
+def get_trade_index(df: pd.DataFrame) -> TradeIndex:
+    """Index of `df`, built on first use and dropped with `df`."""
+    return _INDEXES.get(df)
+
+
+def filter_entities(
+    df: pd.DataFrame,
+    tickers: Optional[List[str]] = None,
+    insider_keys: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Trades of `df` in the companies of `tickers` and by the insiders of `insider_keys` (CIKs or normalized names)."""
+    if not tickers and not insider_keys:
+        return df
+    dimensions = get_trade_index(df).dimensions
+    mask = np.ones(len(df), dtype=bool)
+    if tickers:
+        mask &= dimensions.company_mask(tickers)
+    if insider_keys:
+        mask &= dimensions.insider_mask(insider_keys)
+    return df[mask]
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import glob
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+import pandas as pd
+try:
+    import fcntl
+except ImportError:  # Windows: writes are only serialized within the process
+    fcntl = None
+
+from open_insider.column_parsers import restore_dtypes
+from consts import DATA_DIR
+
+
+_WRITE_LOCK = threading.RLock()  # Serializes read-modify-writes of partitions and meta by the threads of the process
+_lock_files: Dict[str, Any] = {}  # Lock file held by the process for each store root, and its depth; under `_WRITE_LOCK`
+
+class TradeStore:
+    """Local Parquet store of processed OpenInsider trades, partitioned by filing month and shared across processes."""
+
+    KEY_COLUMNS = ["Filing Date", "Trade Date", "Ticker", "Insider Name", "Trade Type", "Price", "Quantity", "Owned"]
+
+    def __init__(self, root: str = os.path.join(DATA_DIR, "trades"), ttl: int = 300) -> None:
+        self.root = root
+        self.ttl = ttl
+        os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.root, "meta.json")
+
+    @classmethod
+    def trade_keys(cls, df: pd.DataFrame) -> pd.Series:
+        """Identity key of each trade, stable across scrapes of the same filing."""
+        # Formatted column by column: a frame formats its datetime columns together when they share a block
+        columns = {column: df[column].astype(str) for column in cls.KEY_COLUMNS}
+        keys = pd.util.hash_pandas_object(pd.DataFrame(columns, index=df.index), index=False)
+        return keys.astype("int64")
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """
+        Serializes read-modify-writes of the store by the threads of this process and, through an exclusive lock
+        on a file in the store, by other processes (e.g. a backfill running next to the app).
+        """
+        with _WRITE_LOCK:
+            if fcntl is None:
+                yield
+                return
+            lock_file, depth = _lock_files.get(self.root, (None, 0))
+            if lock_file is None:
+                lock_file = open(os.path.join(self.root, ".lock"), "w")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            _lock_files[self.root] = (lock_file, depth + 1)
+            try:
+                yield
+            finally:
+                if depth == 0:
+                    del _lock_files[self.root]
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+                else:
+                    _lock_files[self.root] = (lock_file, depth)
+
+    @staticmethod
+    def _atomic_write(path: str, write) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def read_meta(self) -> Dict[str, Any]:
+        if not os.path.exists(self.meta_path):
+            return {}
+        with open(self.meta_path) as f:
+            return json.load(f)
+
+    def update_meta(self, **meta: Any) -> None:
+        with self.write_lock():
+            updated = {**self.read_meta(), **meta}
+            def _write(path: str) -> None:
+                with open(path, "w") as f:
+                    json.dump(updated, f)
+            self._atomic_write(self.meta_path, _write)
+
+    @property
+    def covered_since(self) -> pd.Timestamp | None:
+        """Earliest filing date from which the store holds every filing (all titles, all values)."""
+        covered_since = self.read_meta().get("covered_since")
+        return pd.Timestamp(covered_since) if covered_since else None
+
+    def is_stale(self) -> bool:
+        return time.time() - self.read_meta().get("last_refresh", 0) > self.ttl
+
+    def partitions(self, since: Optional[pd.Timestamp] = None) -> List[str]:
+        paths = sorted(glob.glob(os.path.join(self.root, "*.parquet")))
+        if since is not None:
+            paths = [p for p in paths if os.path.basename(p)[:7] >= since.strftime("%Y-%m")]
+        return paths
+
+    def latest_filing_date(self) -> pd.Timestamp | None:
+        paths = self.partitions()
+        if not paths:
+            return None
+        return pd.read_parquet(paths[-1], columns=["Filing Date"])["Filing Date"].max()
+
+    def read(self, since: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        paths = self.partitions(since)
+        if not paths:
+            return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+        if since is not None:
+            df = df[df["Filing Date"] >= since]
+        df = restore_dtypes(df)
+        return df.drop(columns="trade_key").sort_values("Filing Date", ascending=False, ignore_index=True)
+
+    def write(self, df: pd.DataFrame) -> int:
+        """Upserts trades into their filing-month partitions; returns the number of previously unseen trades."""
+        if df.empty:
+            return 0
+        df = df.assign(trade_key=self.trade_keys(df))
+        num_new = 0
+        with self.write_lock():
+            for month, df_month in df.groupby(df["Filing Date"].dt.strftime("%Y-%m")):
+                path = os.path.join(self.root, f"{month}.parquet")
+                if os.path.exists(path):
+                    df_existing = pd.read_parquet(path)
+                    num_new += int((~df_month["trade_key"].isin(df_existing["trade_key"])).sum())
+                    df_month = pd.concat([df_existing, df_month], ignore_index=True)
+                else:
+                    num_new += len(df_month)
+                df_month = df_month.drop_duplicates("trade_key", keep="last").sort_values("Filing Date", ascending=False)
+                self._atomic_write(path, lambda tmp_path: df_month.to_parquet(tmp_path, index=False))
+        return num_new
+
+    def clear(self) -> None:
+        for path in self.partitions() + [self.meta_path]:
+            if os.path.exists(path):
+                os.remove(path)
@@ -1,8 +1,11 @@
 from typing import List, Union, Optional
+from datetime import date
 
 from open_insider.parameters.job_titles import JobTitlesParam
 from open_insider.parameters.num_results import NumResultsParam
 from open_insider.parameters.trade_value import TradeValueParams
+from open_insider.parameters.filing_date import FilingDateParams
+from open_insider.parameters.page import PageParam
 from consts import OI_URL
 
 
@@ -15,12 +18,20 @@ class URLBuilder:
         job_titles: Optional[Union[str, List[str]]] = None,
         trade_val_min: Optional[int] = None,
         trade_val_max: Optional[int] = None,
+        filing_date_min: Optional[Union[str, date]] = None,
+        filing_date_max: Optional[Union[str, date]] = None,
+        page: int = 1,
     ) -> None:
         self.num_results = NumResultsParam.validate(num_results)
         self.job_titles = JobTitlesParam.validate(job_titles)
         self.trade_val_min, self.trade_val_max = TradeValueParams.validate(trade_val_min, trade_val_max)
+        self.filing_date_min, self.filing_date_max = FilingDateParams.validate(filing_date_min, filing_date_max)
+        self.page = PageParam.validate(page)
     
     def build(self) -> str:
         job_titles_params = JobTitlesParam.to_url_params(self.job_titles)
         trade_val_params = TradeValueParams.to_url_params(self.trade_val_min, self.trade_val_max)
-        return f"{self.BASE_URL}?cnt={self.num_results}&{job_titles_params}&{trade_val_params}".rstrip("&")
\ No newline at end of file
+        filing_date_params = FilingDateParams.to_url_params(self.filing_date_min, self.filing_date_max)
+        page_params = PageParam.to_url_params(self.page)
+        params = [f"cnt={self.num_results}", job_titles_params, trade_val_params, filing_date_params, page_params]
+        return f"{self.BASE_URL}?" + "&".join(p for p in params if p)
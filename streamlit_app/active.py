@@ -2,6 +2,8 @@ from typing import Dict, Any
 import pandas as pd
 import streamlit as st
 
+from streamlit_app.shared import DEFAULT_DATASET, get_dataset
+
 
 def set_active_dataset_and_params(
     *,
@@ -14,8 +16,8 @@ def set_active_dataset_and_params(
     }
 
 def get_active_dataset() -> pd.DataFrame | None:
-    dataset_name = st.session_state["active"]["dataset"]
-    return st.session_state["datasets"][dataset_name]
+    active = st.session_state["active"]
+    return get_dataset(None if active["dataset"] == DEFAULT_DATASET else active["params"])
 
 def get_active_params() -> Dict[str, Any] | None:
     return st.session_state["active"]["params"]
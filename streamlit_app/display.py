@@ -0,0 +1,54 @@
+from typing import Dict, Any, List
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+HIDDEN_COLUMNS = ["Title Mask", "Trade Code", "Insider CIK"]  # Internal encodings and identifiers
+
+# Formats applied by the browser to the numeric values, so no string columns are built
+TRADES_COLUMN_CONFIG: Dict[str, Any] = {
+    "Filing Date": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss"),
+    "Trade Date": st.column_config.DateColumn(format="YYYY-MM-DD"),
+    "Price": st.column_config.NumberColumn(format="dollar"),
+    "Value": st.column_config.NumberColumn(format="dollar"),
+    "Quantity": st.column_config.NumberColumn(format="localized"),
+    "Owned": st.column_config.NumberColumn(format="localized"),
+    "ΔOwn": st.column_config.NumberColumn(format="percent"),
+}
+
+
+def visible_columns(df: pd.DataFrame) -> List[str]:
+    return [column for column in df.columns if column not in HIDDEN_COLUMNS]
+
+
+def display_trades_table(
+    trades: pd.DataFrame,
+    key: str,
+    page_size: int = 100,
+    sort_by: str | None = None,
+    ascending: bool = True,
+) -> None:
+    """
+    Displays one page of `trades` (read-only; never copied or converted to strings), with a page selector
+    when there is more than one page. Only the rows of the page are sent to the browser.
+    """
+    num_pages = max(1, -(-len(trades) // page_size))
+    page = 1
+    if num_pages > 1:
+        page_col, caption_col = st.columns([1, 3], vertical_alignment="bottom")
+        with page_col:
+            page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1, key=f"{key}_page")
+        with caption_col:
+            first_row = (page - 1) * page_size
+            st.caption(f"Rows {first_row + 1:,}-{min(first_row + page_size, len(trades)):,} of {len(trades):,}")
+    positions = np.arange((page - 1) * page_size, min(page * page_size, len(trades)))
+    if sort_by is not None:
+        order = np.argsort(trades[sort_by].to_numpy(), kind="stable")
+        positions = (order if ascending else order[::-1])[positions]
+    st.dataframe(
+        trades.iloc[positions],
+        column_order=visible_columns(trades),
+        column_config=TRADES_COLUMN_CONFIG,
+        hide_index=True,
+    )
@@ -4,9 +4,10 @@ import pandas as pd
 from streamlit.delta_generator import DeltaGenerator
 
 from open_insider.parameters.job_titles import JobTitlesParam
-from open_insider.query_agent import QueryAgent
+from open_insider.trade_index import get_trade_index
 
 from streamlit_app.active import set_active_dataset_and_params
+from streamlit_app.shared import DEFAULT_DATASET, dataset_key, get_dataset
 
 def display_and_extract_filters(
     *,
@@ -18,8 +19,9 @@ def display_and_extract_filters(
     popover.write("##### Select Filters")
     all_trade_types = default_dataset['Trade Type'].unique()
     all_job_titles = list(JobTitlesParam.JOB_TITLE_MAP.keys())
-    all_insiders = default_dataset['Insider Name'].unique()
-    all_companies = default_dataset['Company Name'].unique()
+    dimensions = get_trade_index(default_dataset).dimensions  # Options precomputed once per dataset
+    insider_labels = dimensions.insider_labels
+    company_labels = dimensions.company_labels
     default_trade_types = ["P - Purchase", "S - Sale"]
     selected_trade_types = popover.multiselect(
         "Select Trade Types",
@@ -27,8 +29,8 @@ def display_and_extract_filters(
         default=[tt for tt in default_trade_types if tt in all_trade_types]
     )
     selected_job_titles = popover.multiselect("Select Job Titles", all_job_titles)
-    selected_insiders = popover.multiselect("Select Insiders", all_insiders)
-    selected_companies = popover.multiselect("Select Companies", all_companies)
+    selected_insiders = popover.multiselect("Select Insiders", insider_labels, format_func=insider_labels.get)
+    selected_companies = popover.multiselect("Select Companies", company_labels, format_func=company_labels.get)
     selected_trade_val_min = popover.number_input(
         "Min Trade Value",
         min_value=0,
@@ -52,38 +54,25 @@ def display_and_extract_filters(
 
 def apply_filters(
     *,
-    query_agent: QueryAgent,
     selected_filters: Dict[str, Any],
     max_rows: int = 5000,
-    apply_filters: bool
 ) -> None:
-    if apply_filters:
-        if st.session_state["active"]["params"] == selected_filters:
+    if st.session_state["active"]["params"] == selected_filters:
+        set_active_dataset_and_params(
+            dataset_name=DEFAULT_DATASET,
+            params=selected_filters,
+        )
+    else:
+        df = get_dataset(selected_filters, max_rows=max_rows)
+        if df is None:
+            st.error("Failed to load data from OpenInsider.")
+        elif df.empty:
+            st.warning("No trades match the selected filters.")
+        else:
             set_active_dataset_and_params(
-                dataset_name="default",
+                dataset_name=dataset_key(selected_filters),
                 params=selected_filters,
             )
-        else:
-            if st.session_state["active"]["params"] != selected_filters:
-                df = query_agent.scrape(
-                    trade_types=[tt.split(" - ")[0] for tt in selected_filters["trade_types"]],
-                    job_titles=selected_filters["job_titles"],
-                    trade_val_min=selected_filters["trade_val_min"],
-                    trade_val_max=selected_filters["trade_val_max"],
-                    num_results=max_rows,
-                )
-                if df.empty:
-                    st.error("Failed to load data from OpenInsider.")
-                else:
-                    if selected_filters["companies"]:
-                        df = df[df['Company Name'].isin(selected_filters["companies"])]
-                    if selected_filters["insiders"]:
-                        df = df[df['Insider Name'].isin(selected_filters["insiders"])]
-                    st.session_state["datasets"]["filtered"] = df
-                    set_active_dataset_and_params(
-                        dataset_name="filtered",
-                        params=selected_filters,
-                    )
 
 
 def display_active_filters(
@@ -1,10 +1,12 @@
 import pandas as pd
-import numpy as np
 import streamlit as st
+import plotly.express as px
 import plotly.graph_objects as go
 
 from utils.plotly_utils import create_categorical_chart, create_time_series_chart
-from consts import TEMPORAL_GBS
+from utils.time_buckets import is_time_bucket
+from open_insider.aggregate import SIGNAL_AGGREGATIONS
+from utils.instrumentation import span
 
 
 def plot_trade_chart(
@@ -12,27 +14,55 @@ def plot_trade_chart(
     x: str,
     aggregation: str,
     groupby: str,
-    top_n: int = None
+    top_n: int = None,
+    color: str | None = None,
 ) -> go.Figure:
     """Determines the appropriate chart type and renders it."""
     title = f"{aggregation} of Trades Over Time".replace('Total of', 'Total')
-    if groupby in TEMPORAL_GBS:
-        fig = create_time_series_chart(
-            df=df_plot,
-            x=x,
-            aggregation=aggregation,
-            groupby=groupby,
-            title=title
-        )
-    else:
-        fig = create_categorical_chart(
-            df=df_plot,
-            x=x,
-            aggregation=aggregation,
-            groupby=groupby,
-            top_n=top_n,
-            title=title
+    if aggregation in SIGNAL_AGGREGATIONS:
+        title = f"{aggregation} Over Time"
+    with span("plot", chart="trades"):
+        if is_time_bucket(groupby):
+            fig = create_time_series_chart(
+                df=df_plot,
+                x=x,
+                aggregation=aggregation,
+                groupby=groupby,
+                title=title,
+                color=color,
+            )
+        else:
+            fig = create_categorical_chart(
+                df=df_plot,
+                x=x,
+                aggregation=aggregation,
+                groupby=groupby,
+                top_n=top_n,
+                title=title
+            )
+    st.plotly_chart(fig)
+    return fig
+
+
+def plot_average_returns(
+    df_returns: pd.DataFrame,
+    by: str,
+    horizon: str,
+    benchmark: str,
+) -> go.Figure:
+    """Bar chart of the average return and excess return over `horizon` of each bucket of trades."""
+    df_plot = df_returns.reset_index()
+    with span("plot", chart="returns"):
+        fig = px.bar(
+            df_plot,
+            x=by,
+            y=[f"Return {horizon}", f"Excess Return {horizon}"],
+            barmode="group",
+            title=f"Average {horizon} Return After Purchases (Excess vs. {benchmark})",
+            labels={"value": "Average Return", "variable": ""},
+            hover_data=["Trades"],
         )
+        fig.update_yaxes(tickformat=".1%")
     st.plotly_chart(fig)
     return fig
 
@@ -42,8 +72,7 @@ def plot_company_stock_and_trades(
     ticker_stock_data: pd.DataFrame,
     show: bool = False
 ) -> go.Figure:
-    # Convert date columns to datetime
-    ticker_trading_data["Trade Date"] = pd.to_datetime(ticker_trading_data["Trade Date"])
+    # Convert the stock data's dates to datetime (trade dates are parsed when scraped)
     ticker_stock_data.index = pd.to_datetime(ticker_stock_data.index)
     
     # Create stock price line plot
@@ -0,0 +1,65 @@
+import logging
+import time
+import threading
+import streamlit as st
+
+from streamlit_app.shared import DEFAULT_DATASET, SharedDatasets, get_shared_datasets, dataset_loader
+from utils.instrumentation import span
+
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetRefresher(threading.Thread):
+    """Daemon thread that keeps the default dataset and the most requested filter selections warm."""
+
+    def __init__(self, datasets: SharedDatasets, interval: int = 300, num_popular: int = 3) -> None:
+        super().__init__(name="dataset-refresher", daemon=True)
+        self.datasets = datasets
+        self.interval = interval
+        self.num_popular = num_popular
+        self._stop_event = threading.Event()
+
+    def refresh_once(self) -> None:
+        keys = [DEFAULT_DATASET] + [k for k in self.datasets.popular_keys(self.num_popular + 1) if k != DEFAULT_DATASET]
+        keys = keys[:self.num_popular + 1]
+        self.datasets.refreshed_keys = set(keys)  # Kept (and served stale) until refreshed; others can be evicted
+        for key in keys:
+            try:
+                with span("dataset_refresh", dataset="default" if key == DEFAULT_DATASET else "popular"):
+                    self.datasets.refresh(key)
+                logger.info(f"Refreshed dataset {key[:80]}")
+            except Exception as e:
+                logger.warning(f"Error refreshing dataset {key[:80]}, keeping stale data: {e}")
+
+    def run(self) -> None:
+        self.refresh_once()
+        while not self._stop_event.wait(self.interval):
+            self.refresh_once()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+@st.cache_resource(show_spinner=False)
+def start_refresher(max_rows: int = 5000, interval: int = 300) -> DatasetRefresher:
+    """Starts the process's refresher once; from then on the datasets it refreshes are served until refreshed."""
+    datasets = get_shared_datasets()
+    datasets.register(DEFAULT_DATASET, dataset_loader(max_rows=max_rows))
+    datasets.refreshed_keys = {DEFAULT_DATASET}
+    datasets.serve_stale = True  # The refresher's first load of the default dataset is shared with cold readers
+    refresher = DatasetRefresher(datasets, interval=interval)
+    refresher.start()
+    return refresher
+
+
+def display_data_freshness(datasets: SharedDatasets, key: str, stale_after: int) -> None:
+    loaded_at = datasets.loaded_at(key)
+    if loaded_at is None:
+        return
+    age_minutes = int((time.time() - loaded_at) // 60)
+    as_of = f"Data as of {time.strftime('%Y-%m-%d %H:%M', time.localtime(loaded_at))} ({age_minutes} min ago)"
+    if time.time() - loaded_at > stale_after:
+        st.warning(f"{as_of}. OpenInsider could not be refreshed recently; showing the latest data available.")
+    else:
+        st.caption(as_of)
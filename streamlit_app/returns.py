@@ -0,0 +1,61 @@
+import pandas as pd
+import streamlit as st
+
+from yahoo_finance.event_study import (
+    HORIZONS,
+    BENCHMARK,
+    load_price_panel,
+    price_window_days,
+    forward_returns,
+    average_returns_by_title,
+    average_returns_by_size,
+)
+from streamlit_app.plot import plot_average_returns
+
+
+RETURN_BUCKETS = {
+    "Title": average_returns_by_title,
+    "Size": average_returns_by_size,
+}
+
+
+@st.cache_data(ttl=3600, show_spinner="Loading prices & computing post-trade returns...")
+def get_post_trade_returns(trades: pd.DataFrame, benchmark: str = BENCHMARK) -> pd.DataFrame:
+    start_date = trades["Filing Date"].min().normalize()
+    end_date = min(
+        trades["Filing Date"].max().normalize() + pd.Timedelta(days=price_window_days()),
+        pd.Timestamp.today().normalize() + pd.Timedelta(days=1),
+    )
+    prices = load_price_panel(
+        trades["Ticker"].unique(),
+        start_date.strftime("%Y-%m-%d"),
+        end_date.strftime("%Y-%m-%d"),
+        benchmark=benchmark,
+    )
+    return forward_returns(trades, prices, benchmark=benchmark)
+
+
+def display_post_trade_returns(dataset: pd.DataFrame) -> None:
+    st.write("#### Average Return After Insider Purchases")
+    purchases = dataset.loc[dataset["Trade Code"] == "P", ["Ticker", "Filing Date", "Value", "Title Mask"]]
+    if purchases.empty:
+        st.info("There are no purchases in the selected trades.")
+        return
+    by_col, horizon_col = st.columns(2)
+    with by_col:
+        by = st.selectbox("Bucket Purchases By", list(RETURN_BUCKETS.keys()))
+    with horizon_col:
+        horizon = st.selectbox("Horizon", list(HORIZONS.keys()), index=2)
+    if not st.toggle(f"Load prices for {purchases['Ticker'].nunique()} companies & {BENCHMARK}"):
+        return
+    try:
+        returns = get_post_trade_returns(purchases)
+    except Exception as error:
+        st.error(f"Failed to load prices: {error}")
+        return
+    df_returns = RETURN_BUCKETS[by](purchases, returns)
+    plot_average_returns(df_returns, by=by, horizon=horizon, benchmark=BENCHMARK)
+    st.dataframe(
+        df_returns,
+        column_config={column: st.column_config.NumberColumn(format="percent") for column in returns.columns},
+    )
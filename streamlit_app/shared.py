@@ -0,0 +1,222 @@
+import json
+import logging
+import time
+import threading
+from functools import partial
+from collections import Counter, OrderedDict
+from typing import Dict, Any, Tuple, Callable, Optional, List, Set
+import pandas as pd
+import streamlit as st
+
+from open_insider.query_agent import QueryAgent
+from open_insider.trade_store import TradeStore
+from open_insider.trade_index import get_trade_index, filter_entities
+from utils.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET = "default"
+
+
+class SharedDatasets:
+    """
+    Process-wide cache of datasets read by every session, each expiring `ttl` seconds after it was loaded.
+
+    Cached frames are shared, not copied, so callers must treat them as read-only. Each dataset's loader is
+    kept so it can be reloaded: while a background refresher runs (`serve_stale`), the datasets it refreshes
+    (`refreshed_keys`) keep being served after they expire until it swaps in the new frame. Other expired datasets
+    are served stale to `get_or_load` while it reloads them in a background thread, so readers only wait on
+    OpenInsider for datasets they have no copy of. At most `max_datasets` are kept (least recently read first
+    out). Concurrent loads of the same dataset (e.g. a first reader and the refresher) share one scrape.
+    """
+
+    def __init__(self, ttl: int = 900, max_datasets: int = 32) -> None:
+        self.ttl = ttl
+        self.max_datasets = max_datasets
+        self.serve_stale = False
+        self.refreshed_keys: Set[str] = set()
+        self._datasets: OrderedDict[str, Tuple[float, pd.DataFrame]] = OrderedDict()  # Least recently read first
+        self._loaders: OrderedDict[str, Callable[..., pd.DataFrame | None]] = OrderedDict()
+        self._requests: Counter = Counter()
+        self._in_flight: SingleFlight[pd.DataFrame | None] = SingleFlight()
+        self._refreshing: Set[str] = set()  # Expired datasets being reloaded in the background
+        self._lock = threading.Lock()
+
+    def _is_kept_stale(self, key: str) -> bool:
+        return self.serve_stale and key in self.refreshed_keys
+
+    def _read(self, key: str) -> Tuple[pd.DataFrame | None, bool]:
+        """The cached frame of `key` (None if there is none), and whether it is still fresh."""
+        with self._lock:
+            loaded_at, df = self._datasets.get(key, (0, None))
+            if df is not None:
+                self._datasets.move_to_end(key)
+        return df, time.time() - loaded_at <= self.ttl or self._is_kept_stale(key)
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        df, is_fresh = self._read(key)
+        return df if is_fresh else None
+
+    def loaded_at(self, key: str) -> float | None:
+        with self._lock:
+            return self._datasets[key][0] if key in self._datasets else None
+
+    def _evict(self) -> None:
+        """Drops the least recently read datasets beyond `max_datasets`, except those kept by the refresher."""
+        evictable = [key for key in self._datasets if key not in self.refreshed_keys]
+        for key in evictable[:max(0, len(self._datasets) - self.max_datasets)]:
+            del self._datasets[key]
+        stale_loaders = [key for key in self._loaders if key not in self._datasets and key not in self.refreshed_keys]
+        for key in stale_loaders[:max(0, len(self._loaders) - self.max_datasets)]:
+            del self._loaders[key]
+        for key in [key for key in self._requests if key not in self._loaders]:
+            del self._requests[key]
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Swaps in a new frame for `key`; readers holding the previous frame are unaffected."""
+        with self._lock:
+            self._datasets[key] = (time.time(), df)
+            self._datasets.move_to_end(key)
+            self._evict()
+
+    def _load(self, key: str, loader: Callable[..., pd.DataFrame | None], **kwargs: Any) -> pd.DataFrame | None:
+        df = loader(**kwargs)
+        if df is not None:  # Failed loads are retried by the next reader instead of being cached
+            self.put(key, df)
+        return df
+
+    def get_or_load(self, key: str, loader: Callable[..., pd.DataFrame | None]) -> pd.DataFrame | None:
+        """
+        Returns the dataset for `key`, loading it with `loader` (callable as `loader(incremental=...)`) if there is
+        no copy of it; None if that load failed. An expired copy is returned as is while it is refreshed in the
+        background. Empty datasets (no trades match) are cached like any other.
+        """
+        with self._lock:
+            self._loaders[key] = loader
+            self._loaders.move_to_end(key)
+            self._requests[key] += 1
+        df, is_fresh = self._read(key)
+        if df is None:
+            df, _ = self._in_flight.do(key, partial(self._load, key, loader))
+        elif not is_fresh:
+            self._refresh_in_background(key)
+        return df
+
+    def _refresh_in_background(self, key: str) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                self.refresh(key)
+            except Exception as e:
+                logger.warning(f"Error refreshing dataset {key[:80]}, keeping stale data: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="dataset-refresh", daemon=True).start()
+
+    def refresh(self, key: str) -> None:
+        """Reloads `key` with only the filings published since it was loaded."""
+        with self._lock:
+            loader = self._loaders.get(key)
+        if loader is not None:
+            self._in_flight.do(key, partial(self._load, key, loader, incremental=True))
+
+    def register(self, key: str, loader: Callable[..., pd.DataFrame | None]) -> None:
+        with self._lock:
+            self._loaders[key] = loader
+
+    def popular_keys(self, n: int) -> List[str]:
+        with self._lock:
+            return [key for key, _ in self._requests.most_common(n)]
+
+
+@st.cache_resource(show_spinner=False)
+def get_query_agent(max_rows: int = 5000) -> QueryAgent:
+    return QueryAgent(
+        remember=2,  # remember data from up to 2 recent queries
+        max_rows=max_rows,
+        store=TradeStore(),  # persistent local store shared across processes
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_datasets(ttl: int = 900) -> SharedDatasets:
+    return SharedDatasets(ttl=ttl)
+
+
+def dataset_key(filters: Optional[Dict[str, Any]]) -> str:
+    """Canonical name of the dataset selected by `filters`; the default dataset when no filters are applied."""
+    if filters is None:
+        return DEFAULT_DATASET
+    canonical = {k: sorted(v) if isinstance(v, list) else v for k, v in filters.items()}
+    return json.dumps(canonical, sort_keys=True, default=str)
+
+
+def load_default_dataset(
+    query_agent: QueryAgent,
+    max_rows: int = 5000,
+    incremental: bool = False,
+) -> pd.DataFrame | None:
+    """The latest `max_rows` trades; None if OpenInsider could not be scraped."""
+    try:
+        df = query_agent.scrape(
+            trade_types=None,
+            job_titles=None,
+            trade_val_min=None,
+            trade_val_max=None,
+            num_results=max_rows,
+            incremental=incremental,
+            raise_errors=True,
+        )
+    except Exception:
+        return None
+    get_trade_index(df)  # Built by the loader (e.g. the background refresher) rather than the first reader
+    return df
+
+
+def load_filtered_dataset(
+    query_agent: QueryAgent,
+    filters: Dict[str, Any],
+    max_rows: int = 5000,
+    incremental: bool = False,
+) -> pd.DataFrame | None:
+    """The trades selected by `filters` (possibly none); None if OpenInsider could not be scraped."""
+    try:
+        df = query_agent.scrape(
+            trade_types=[tt.split(" - ")[0] for tt in filters["trade_types"]],
+            job_titles=filters["job_titles"],
+            trade_val_min=filters["trade_val_min"],
+            trade_val_max=filters["trade_val_max"],
+            num_results=max_rows,
+            incremental=incremental,
+            raise_errors=True,
+        )
+    except Exception:
+        return None
+    if df.empty:
+        return df
+    return filter_entities(df, tickers=filters["companies"], insider_keys=filters["insiders"])
+
+
+def dataset_loader(
+    filters: Optional[Dict[str, Any]] = None,
+    max_rows: int = 5000,
+) -> Callable[..., pd.DataFrame | None]:
+    query_agent = get_query_agent(max_rows=max_rows)
+    if filters is None:
+        return partial(load_default_dataset, query_agent, max_rows=max_rows)
+    return partial(load_filtered_dataset, query_agent, filters, max_rows=max_rows)
+
+
+def get_dataset(filters: Optional[Dict[str, Any]] = None, max_rows: int = 5000) -> pd.DataFrame | None:
+    """
+    Returns the shared dataset selected by `filters` (the default dataset if None), loading it if needed;
+    None if it could not be loaded.
+    """
+    return get_shared_datasets().get_or_load(dataset_key(filters), dataset_loader(filters, max_rows=max_rows))
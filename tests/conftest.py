@@ -0,0 +1,161 @@
+"""
+Fixtures shared by the tests: a local stand-in for the OpenInsider screener served by `http.server` in a thread,
+and a `QueryAgent` whose fetcher talks to it without the process-wide rate limits.
+"""
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from open_insider.fetcher import Fetcher
+from open_insider.parameters.job_titles import JobTitlesParam
+from open_insider.query_agent import QueryAgent
+from open_insider.trade_store import TradeStore
+from open_insider.url_builder import URLBuilder
+from utils.rate_limiter import RateLimiter
+
+
+HEADERS = [
+    "X", "Filing\xa0Date", "Trade\xa0Date", "Ticker", "Company\xa0Name", "Insider\xa0Name", "Title", "Trade\xa0Type",
+    "Price", "Qty", "Owned", "ΔOwn", "Value", "1d", "1w", "1m", "6m",
+]
+TITLES = ["CEO", "Pres, CEO", "Dir", "10%", "CFO", "EVP", "COB", "Dir, 10%", "GC", "COO"]
+TRADE_TYPES = ["P - Purchase", "S - Sale", "S - Sale+OE", "A - Grant", "M - OptEx"]
+TICKERS = [("AAPL", "Apple Inc"), ("MSFT", "Microsoft Corp"), ("TSLA", "Tesla, Inc."), ("XYZ", "Block, Inc.")]
+
+
+def make_trades(num_trades: int, latest: datetime = datetime(2024, 6, 28, 18, 0)) -> List[Dict[str, Any]]:
+    """Deterministic trades, newest first, one filing every 7 minutes."""
+    trades = []
+    for i in range(num_trades):
+        filed = latest - timedelta(minutes=7 * i)
+        ticker, company = TICKERS[i % len(TICKERS)]
+        trade_type = TRADE_TYPES[i % len(TRADE_TYPES)]
+        price = 10.0 + i % 97
+        quantity = (100 + 37 * i % 5000) * (-1 if trade_type.startswith("S") else 1)
+        trades.append(dict(
+            filed=filed, traded=(filed - timedelta(days=i % 4)).date(), ticker=ticker, company=company,
+            insider=f"Insider {i % 50}", cik=1000000 + i % 50, title=TITLES[i % len(TITLES)], trade_type=trade_type,
+            price=price, quantity=quantity, owned=abs(quantity) * 3, value=round(price * quantity),
+        ))
+    return trades
+
+
+def render_screener(trades: List[Dict[str, Any]]) -> bytes:
+    """Screener page listing `trades`, after a few unrelated layout tables as on the real site."""
+    head = "".join(f"<th><h3>{header}</h3></th>" for header in HEADERS)
+    rows = "".join(
+        f"<tr><td></td><td><div><a href=\"/x\">{t['filed']:%Y-%m-%d %H:%M:%S}</a></div></td>"
+        f"<td><div>{t['traded']:%Y-%m-%d}</div></td><td><b><a href=\"/{t['ticker']}\">{t['ticker']}</a></b></td>"
+        f"<td><a href=\"/{t['ticker']}\">{t['company']}</a></td>"
+        f"<td><a href=\"/insider/{t['insider'].replace(' ', '-')}/{t['cik']}\">{t['insider']}</a></td>"
+        f"<td>{t['title']}</td><td>{t['trade_type']}</td><td align=right>${t['price']:,.2f}</td>"
+        f"<td align=right>{t['quantity']:+,}</td><td align=right>{t['owned']:,}</td><td align=right>+5%</td>"
+        f"<td align=right>{'-' if t['value'] < 0 else '+'}${abs(t['value']):,}</td><td></td><td></td><td></td><td></td></tr>"
+        for t in trades
+    )
+    layout = "".join(f"<table><tr><td>menu {i}</td></tr></table>" for i in range(3))
+    return (
+        f"<html><head><meta charset='utf-8'></head><body>{layout}<table class=\"tinytable\"><thead><tr>{head}</tr>"
+        f"</thead><tbody>{rows}</tbody></table></body></html>"
+    ).encode()
+
+
+class Screener:
+    """
+    Stand-in for the OpenInsider screener, applying the filters of the URL to `trades`. Every request is recorded in
+    `requests`; statuses queued in `statuses` are answered (empty) before any page is served.
+    """
+
+    def __init__(self, trades: List[Dict[str, Any]]) -> None:
+        self.trades = trades
+        self.requests: List[Dict[str, List[str]]] = []
+        self.statuses: List[int] = []
+        self.etags = True
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def page_requests(self) -> int:
+        return len(self.requests)
+
+    def select(self, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        trades = self.trades
+        if "fdr" in query:
+            low, high = (datetime.strptime(day.strip(), "%m/%d/%Y") for day in query["fdr"][0].split(" - "))
+            trades = [t for t in trades if low <= t["filed"] < high + timedelta(days=1)]
+        flags = {flag: job_title for job_title, (_, flag) in JobTitlesParam.JOB_TITLE_MAP.items()}
+        job_titles = {flags[name] for name in query if name in flags}
+        if job_titles and len(job_titles) < len(flags):
+            trades = [t for t in trades if job_titles & set(JobTitlesParam.parse_title(t["title"]))]
+        if "vl" in query:
+            trades = [t for t in trades if abs(t["value"]) >= int(query["vl"][0])]
+        if "vh" in query:
+            trades = [t for t in trades if abs(t["value"]) <= int(query["vh"][0])]
+        num_results, page = int(query.get("cnt", ["100"])[0]), int(query.get("page", ["1"])[0])
+        return trades[(page - 1) * num_results:page * num_results]
+
+    def _handler(self) -> type:
+        screener = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                query = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+                screener.requests.append(query)
+                if screener.statuses:
+                    self.send_response(screener.statuses.pop(0))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = render_screener(screener.select(query))
+                etag = f'"{hash(body)}"'
+                if screener.etags and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if screener.etags:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def screener(monkeypatch):
+    screener = Screener(make_trades(1500))
+    monkeypatch.setattr(URLBuilder, "BASE_URL", f"{screener.url}/screener")
+    yield screener
+    screener.close()
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = Fetcher(backoff_factor=0, rate_limiter=RateLimiter(default_budget=(1000.0, 1000)))
+    yield fetcher
+    fetcher.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TradeStore(str(tmp_path / "trades"))
+
+
+@pytest.fixture
+def query_agent(screener, fetcher):
+    return QueryAgent(remember=5, fetcher=fetcher)
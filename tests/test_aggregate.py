@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from open_insider.aggregate import apply_gb_and_agg
+from open_insider.signals import NET_WINDOW_DAYS, compute_signals
+
+
+@pytest.fixture
+def trades(query_agent):
+    return query_agent.scrape(trade_types=None, num_results=1500)
+
+
+def test_rolling_net_purchases_sum_the_window_ending_each_bucket(trades):
+    df_plot, x = apply_gb_and_agg("Week", "Rolling Net Purchases", trades)
+    net_values = compute_signals(trades)["Signed Value"]
+    days = trades["Trade Date"].dt.normalize()
+    for week in df_plot[x]:
+        last_day = days[(days >= week) & (days < week + pd.Timedelta(days=7))].max()
+        in_window = (days > last_day - pd.Timedelta(days=NET_WINDOW_DAYS)) & (days <= last_day)
+        expected = net_values[in_window].sum()
+        assert df_plot.loc[df_plot[x] == week, "Rolling Net Purchases"].item() == pytest.approx(expected)
+
+
+def test_rolling_net_purchases_of_companies_end_on_the_last_trade_date(trades):
+    df_plot, x = apply_gb_and_agg("Company", "Rolling Net Purchases", trades)
+    days = trades["Trade Date"].dt.normalize()
+    recent = days > days.max() - pd.Timedelta(days=NET_WINDOW_DAYS)
+    expected = compute_signals(trades)["Signed Value"][recent].groupby(trades["Company Name"], observed=True).sum()
+    assert df_plot.set_index(x)["Rolling Net Purchases"].to_dict() == pytest.approx(expected.to_dict())
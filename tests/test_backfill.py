@@ -0,0 +1,12 @@
+from open_insider.backfill import Backfill
+
+
+def test_resumed_backfill_only_fetches_new_windows(screener, store):
+    backfill = Backfill("2024-06-20", "2024-06-25", window_days=2, store=store)
+    assert backfill.run() > 0
+    requests = screener.page_requests
+    resumed = Backfill("2024-06-20", "2024-06-28", window_days=2, store=store)
+    assert [resumed.window_key(window) for window in resumed.windows[-3:]] == backfill.completed[::-1]
+    resumed.run()
+    assert screener.page_requests == requests + 2  # 06-26/06-27 and 06-28/06-28
+    assert len(store.read()) == len(screener.select({"cnt": ["5000"]}))
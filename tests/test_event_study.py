@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from yahoo_finance.event_study import forward_returns
+
+
+def make_prices(tickers=("AAPL", "SPY"), start="2024-06-03", end="2024-07-31") -> pd.DataFrame:
+    """Business-day closes rising by 1 a day, SPY at a tenth of the slope."""
+    dates = pd.bdate_range(start, end)
+    return pd.concat(
+        pd.DataFrame({"Date": dates, "Ticker": ticker, "Close": 100.0 + np.arange(len(dates)) * slope})
+        for ticker, slope in zip(tickers, (1.0, 0.1))
+    ).reset_index(drop=True)
+
+
+def closes_on(prices: pd.DataFrame, ticker: str, *days: str) -> list:
+    closes = prices[prices["Ticker"] == ticker].set_index("Date")["Close"]
+    return [closes[pd.Timestamp(day)] for day in days]
+
+
+def test_entry_is_the_first_close_after_the_filing():
+    prices = make_prices()
+    trades = pd.DataFrame({
+        "Ticker": ["AAPL", "AAPL", "AAPL"],
+        "Filing Date": pd.to_datetime(["2024-06-12 10:30", "2024-06-12 18:05", "2024-06-15 09:00"]),
+    })
+    returns = forward_returns(trades, prices, horizons={"1d": 1, "1w": 5})
+    during, after_hours, weekend = (
+        closes_on(prices, "AAPL", "2024-06-12", "2024-06-13", "2024-06-19"),
+        closes_on(prices, "AAPL", "2024-06-13", "2024-06-14", "2024-06-20"),
+        closes_on(prices, "AAPL", "2024-06-17", "2024-06-18", "2024-06-24"),
+    )
+    for row, (entry, one_day, one_week) in enumerate([during, after_hours, weekend]):
+        assert returns["Return 1d"].iloc[row] == one_day / entry - 1
+        assert returns["Return 1w"].iloc[row] == one_week / entry - 1
+    assert (returns["Return 1d"] != 0).all()
+    spy_entry, spy_exit = closes_on(prices, "SPY", "2024-06-17", "2024-06-18")
+    assert np.isclose(returns["Excess Return 1d"].iloc[2], weekend[1] / weekend[0] - spy_exit / spy_entry)
+
+
+def test_horizons_not_yet_elapsed_are_nan():
+    prices = make_prices()
+    trades = pd.DataFrame({"Ticker": ["AAPL", "MSFT"], "Filing Date": pd.to_datetime(["2024-07-29 12:00"] * 2)})
+    returns = forward_returns(trades, prices, horizons={"1d": 1, "1w": 5})
+    entry, one_day = closes_on(prices, "AAPL", "2024-07-29", "2024-07-30")
+    assert returns["Return 1d"].iloc[0] == one_day / entry - 1
+    assert np.isnan(returns["Return 1w"].iloc[0])
+    assert returns.loc[1].isna().all()
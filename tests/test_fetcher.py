@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+import requests
+
+from open_insider.screener_parser import parse_screener_table
+from conftest import make_trades, render_screener
+
+
+def test_retries_server_errors(screener, fetcher):
+    screener.statuses = [503, 502]
+    page = fetcher.fetch(f"{screener.url}/screener?cnt=10")
+    assert len(parse_screener_table(page)) == 10
+    assert screener.page_requests == 3
+
+
+def test_gives_up_after_the_last_retry(screener, fetcher):
+    screener.statuses = [500] * (fetcher.retries + 1)
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch(f"{screener.url}/screener?cnt=10")
+    assert screener.page_requests == fetcher.retries + 1
+
+
+def test_throttling_pauses_and_is_counted(screener, fetcher):
+    fetcher.rate_limiter.THROTTLE_PAUSE = 0
+    screener.statuses = [429]
+    fetcher.fetch(f"{screener.url}/screener?cnt=10")
+    counters = fetcher.rate_limiter.counters()["127.0.0.1"]
+    assert counters["throttled"] == 1
+    assert counters["requests"] == 2
+
+
+@pytest.mark.parametrize("etags", [True, False])
+def test_unchanged_pages_are_reused(screener, fetcher, etags):
+    screener.etags = etags
+    url = f"{screener.url}/screener?cnt=10"
+    first, second = fetcher.fetch(url), fetcher.fetch(url)
+    assert first == second
+    assert fetcher.rate_limiter.counters()["127.0.0.1"]["cache_hits"] == int(etags)
+    assert screener.page_requests == 2
+
+
+def test_parses_the_results_table():
+    trades = make_trades(3)
+    df = parse_screener_table(render_screener(trades))
+    assert len(df) == 3
+    assert df["Filing Date"].tolist() == [pd.Timestamp(t["filed"]) for t in trades]
+    assert df["Ticker"].tolist() == [t["ticker"] for t in trades]
+    assert df["Title"].tolist() == [t["title"] for t in trades]
+    assert df["Qty"].tolist() == [t["quantity"] for t in trades]
+    assert df["Value"].tolist() == [t["value"] for t in trades]
+    assert df["Insider CIK"].tolist() == [t["cik"] for t in trades]
+
+
+def test_page_without_results_table_is_an_error():
+    with pytest.raises(ValueError):
+        parse_screener_table(b"<html><body><table><tr><td>maintenance</td></tr></table></body></html>")
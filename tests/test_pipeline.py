@@ -0,0 +1,24 @@
+import os
+
+import pandas as pd
+import pytest
+
+from open_insider import pipeline
+
+
+def test_pipeline_writes_trades_and_aggregations(screener, store, tmp_path):
+    outputs = pipeline.run_pipeline(
+        str(tmp_path / "output"), groupbys=["Day"], aggregations=["Total"], num_results=500, store=store
+    )
+    assert sorted(outputs) == ["day_total", "trades"]
+    assert not pd.read_parquet(outputs["trades"]).empty
+
+
+def test_failed_scrape_exits_non_zero_without_writing(screener, store, tmp_path, monkeypatch):
+    screener.statuses = [404, 404]  # The store refresh, then the scrape
+    output_dir = tmp_path / "output"
+    monkeypatch.setattr("sys.argv", ["pipeline", "--output-dir", str(output_dir), "--store", store.root])
+    with pytest.raises(SystemExit) as exit_info:
+        pipeline.main()
+    assert exit_info.value.code != 0
+    assert not os.path.exists(output_dir)
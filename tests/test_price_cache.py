@@ -0,0 +1,37 @@
+import pandas as pd
+
+from yahoo_finance.price_cache import PriceCache
+
+
+NO_BARS = pd.DataFrame(columns=["Close", "Volume"], index=pd.DatetimeIndex([], name="Date"), dtype=float)
+
+
+def bars(start: str, end: str) -> pd.DataFrame:
+    index = pd.bdate_range(start, end, inclusive="left", name="Date")
+    return pd.DataFrame({"Close": range(len(index)), "Volume": 100}, index=index, dtype=float)
+
+
+def test_download_is_cached_and_read_back(tmp_path):
+    cache = PriceCache(str(tmp_path))
+    cache.write("AAPL", bars("2024-06-03", "2024-06-17"), "2024-06-01", "2024-06-17")
+    assert cache.missing_ranges("AAPL", "2024-06-01", "2024-06-17") == []
+    assert cache.missing_ranges("AAPL", "2024-05-20", "2024-06-20") == [
+        ("2024-05-20", "2024-06-01"), ("2024-06-17", "2024-06-20")
+    ]
+    assert len(cache.read("AAPL", "2024-06-10", "2024-06-17")) == 5
+
+
+def test_disjoint_downloads_are_merged(tmp_path):
+    cache = PriceCache(str(tmp_path))
+    cache.write("AAPL", bars("2024-06-03", "2024-06-10"), "2024-06-03", "2024-06-10")
+    cache.write("AAPL", bars("2024-06-17", "2024-06-24"), "2024-06-17", "2024-06-24")
+    assert cache.missing_ranges("AAPL", "2024-06-03", "2024-06-24") == [("2024-06-10", "2024-06-17")]
+    assert len(cache.read("AAPL", "2024-06-03", "2024-06-24")) == 10
+
+
+def test_empty_download_only_covers_ranges_without_sessions(tmp_path):
+    cache = PriceCache(str(tmp_path))
+    cache.write("AAPL", NO_BARS, "2024-06-03", "2024-06-10")  # Failed or throttled
+    assert cache.missing_ranges("AAPL", "2024-06-03", "2024-06-10") == [("2024-06-03", "2024-06-10")]
+    cache.write("AAPL", NO_BARS, "2024-03-29", "2024-04-01")  # Good Friday and weekend
+    assert cache.missing_ranges("AAPL", "2024-03-29", "2024-04-01") == []
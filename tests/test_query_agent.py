@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pandas as pd
+
+from conftest import make_trades
+from open_insider.query_agent import QueryAgent
+from open_insider.trade_store import TradeStore
+
+
+def test_identical_query_is_answered_without_fetching(screener, query_agent):
+    df = query_agent.scrape(trade_types=None, num_results=1000)
+    assert len(df) == 1000  # The query hit its row cap
+    requests = screener.page_requests
+    pd.testing.assert_frame_equal(query_agent.scrape(trade_types=None, num_results=1000), df)
+    assert screener.page_requests == requests
+
+
+def test_trade_type_change_is_answered_without_fetching(screener, query_agent):
+    query_agent.scrape(trade_types=["P", "S"], num_results=1000)
+    requests = screener.page_requests
+    df = query_agent.scrape(trade_types=["P"], num_results=1000)
+    assert screener.page_requests == requests
+    assert not df.empty and (df["Trade Type"].str.startswith("P")).all()
+
+
+def test_narrower_query_matches_a_fresh_scrape(screener, query_agent, fetcher):
+    query_agent.scrape(num_results=1000)
+    requests = screener.page_requests
+    df = query_agent.scrape(job_titles=["CEO"], trade_val_min=10000, num_results=100)
+    assert screener.page_requests == requests
+    expected = QueryAgent(remember=False, fetcher=fetcher).scrape(job_titles=["CEO"], trade_val_min=10000, num_results=100)
+    assert not df.empty
+    pd.testing.assert_frame_equal(
+        df.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False, check_categorical=False
+    )
+
+
+def test_incremental_scrape_fetches_only_the_delta(screener, query_agent, fetcher):
+    query_agent.scrape(trade_types=None, num_results=1000)
+    screener.trades = make_trades(5, latest=datetime(2024, 6, 29, 9, 0)) + screener.trades
+    requests = screener.page_requests
+    df = query_agent.scrape(trade_types=None, num_results=1000, incremental=True)
+    assert screener.page_requests == requests + 1  # One delta page, no full query
+    expected = QueryAgent(remember=False, fetcher=fetcher).scrape(trade_types=None, num_results=1000)
+    assert TradeStore.trade_keys(df).tolist() == TradeStore.trade_keys(expected).tolist()
+
+
+def test_incremental_scrape_only_refreshes_datasets_answering_it(screener, query_agent):
+    query_agent.scrape(trade_types=None, job_titles=["CEO"], num_results=100)
+    query_agent.scrape(trade_types=None, job_titles=["CFO"], num_results=100)
+    requests = screener.page_requests
+    query_agent.scrape(trade_types=None, job_titles=["CFO"], num_results=100, incremental=True)
+    assert screener.page_requests == requests + 1
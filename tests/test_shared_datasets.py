@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pandas as pd
+
+from streamlit_app.shared import SharedDatasets
+
+
+class Loader:
+    """Loader returning a frame numbered by its call, blocking incremental reloads until `release` is set."""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, incremental: bool = False) -> pd.DataFrame:
+        self.calls.append(incremental)
+        if incremental:
+            self.release.wait(5)
+        return pd.DataFrame({"Call": [len(self.calls)]})
+
+
+def wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_expired_dataset_is_served_stale_while_it_refreshes():
+    datasets, loader = SharedDatasets(ttl=0), Loader()
+    first = datasets.get_or_load("filters", loader)
+    assert datasets.get("filters") is None  # Expired
+    loader.release.clear()
+    assert datasets.get_or_load("filters", loader) is first  # Without waiting for the reload
+    assert datasets.get_or_load("filters", loader) is first
+    loader.release.set()
+    wait_for(lambda: datasets.get_or_load("filters", loader) is not first)
+    assert loader.calls[:2] == [False, True]  # One full load, then incremental reloads
+
+
+def test_evicted_dataset_is_loaded_again():
+    datasets, loader = SharedDatasets(max_datasets=1), Loader()
+    datasets.get_or_load("a", loader)
+    datasets.get_or_load("b", loader)
+    assert datasets.get("a") is None
+    assert datasets.get_or_load("a", loader)["Call"].item() == 3
+
+
+def test_failed_load_returns_none_and_is_not_cached():
+    datasets, failures = SharedDatasets(), []
+    assert datasets.get_or_load("filters", lambda incremental=False: failures.append(1)) is None
+    assert datasets.get_or_load("filters", lambda incremental=False: failures.append(1)) is None
+    assert len(failures) == 2
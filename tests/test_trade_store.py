@@ -0,0 +1,34 @@
+import pandas as pd
+
+from open_insider.query_agent import QueryAgent
+from open_insider.trade_store import TradeStore
+
+
+def test_write_upserts_and_read_restores(screener, fetcher, store):
+    df = QueryAgent(remember=False, fetcher=fetcher).scrape(trade_types=None, num_results=500)
+    assert store.write(df) == 500
+    assert store.write(df.head(100)) == 0  # Already stored
+    stored = store.read()
+    assert len(stored) == 500
+    assert set(TradeStore.trade_keys(stored)) == set(TradeStore.trade_keys(df))
+    assert stored["Filing Date"].is_monotonic_decreasing
+    assert len(store.read(since=df["Filing Date"].iloc[99])) == 100
+
+
+def test_cold_start_fills_the_store_once(screener, fetcher, store):
+    df = QueryAgent(remember=False, max_rows=1000, store=store, fetcher=fetcher).scrape(num_results=1000)
+    assert screener.page_requests == 1  # The store's first fill answers the query
+    assert not df.empty and store.covered_since is not None
+
+
+def test_fresh_process_is_served_from_a_populated_store(screener, fetcher, store):
+    QueryAgent(remember=False, max_rows=1000, store=store, fetcher=fetcher).scrape(num_results=1000)
+    requests = screener.page_requests
+    query_agent = QueryAgent(remember=False, max_rows=1000, store=TradeStore(store.root), fetcher=fetcher)
+    df = query_agent.scrape(trade_types=None, num_results=1000)
+    assert screener.page_requests == requests
+    assert len(df) == 1000
+    expected = QueryAgent(remember=False, fetcher=fetcher).scrape(trade_types=None, num_results=1000)
+    pd.testing.assert_frame_equal(
+        df.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False, check_categorical=False
+    )
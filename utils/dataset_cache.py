@@ -0,0 +1,40 @@
+import threading
+import weakref
+from typing import Callable, Dict, Generic, TypeVar
+import pandas as pd
+
+from utils.instrumentation import count
+
+
+T = TypeVar("T")
+
+
+class DatasetCache(Generic[T]):
+    """
+    Structures derived from datasets (e.g. rollups, indexes), built once per dataset on first use.
+
+    Shared datasets are immutable and replaced (not modified) on refresh, so entries are keyed by their dataset's
+    identity and dropped once the dataset is garbage collected. Built structures must not reference the dataset.
+    """
+
+    def __init__(self, build: Callable[[pd.DataFrame], T]) -> None:
+        self.build = build
+        self._entries: Dict[int, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, dataset: pd.DataFrame) -> T:
+        key = id(dataset)
+        with self._lock:
+            entry = self._entries.get(key)
+        count("cache_hits" if entry is not None else "cache_misses", cache=getattr(self.build, "__name__", "dataset"))
+        if entry is None:
+            entry = self.build(dataset)
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = entry
+                    weakref.finalize(dataset, self._entries.pop, key, None)
+                entry = self._entries[key]
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,192 @@
+"""
+Timers (spans) and counters around the stages of the app and the pipeline, sent to pluggable sinks.
+
+Instrumentation is off unless sinks are configured, and then costs one attribute check per span or counter.
+Sinks are configured with `configure`, or from the `INSIDER_TRADING_METRICS` environment variable as a
+comma-separated list of `log`, `jsonl=<path>` and `prometheus=<path>`, e.g.:
+    INSIDER_TRADING_METRICS=log,prometheus=.data/metrics.prom streamlit run app.py
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+
+Event = Dict[str, Any]  # {"type": "span" | "counter", "name", "labels", "value", "time"}; span values are in seconds
+
+
+class LoggingSink:
+    """Logs each event through the `logging` module."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self.logger = logger or logging.getLogger("insider_trading.metrics")
+        self.level = level
+
+    def handle(self, event: Event) -> None:
+        labels = " ".join(f"{name}={value}" for name, value in event["labels"].items())
+        if event["type"] == "span":
+            self.logger.log(self.level, f"{event['name']} took {event['value'] * 1000:.1f} ms {labels}".rstrip())
+        else:
+            self.logger.log(self.level, f"{event['name']} +{event['value']} {labels}".rstrip())
+
+
+class JsonLinesSink:
+    """Appends each event to a JSON Lines file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def handle(self, event: Event) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock, open(self.path, "a") as file:
+            file.write(line + "\n")
+
+
+class PrometheusSink:
+    """
+    Aggregates events into counters and span duration sums and counts, rendered in the Prometheus text format.
+    With a `path`, the rendering is rewritten at most every `write_interval` seconds and at exit (e.g. for
+    node_exporter's textfile collector).
+    """
+
+    PREFIX = "insider_trading"
+
+    def __init__(self, path: Optional[str] = None, write_interval: float = 10.0) -> None:
+        self.path = path
+        self.write_interval = write_interval
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+        self.spans: Dict[Tuple[str, Tuple], List[float]] = {}  # [sum, count]
+        self._written = 0.0
+        self._lock = threading.Lock()
+        if path is not None:
+            atexit.register(self.write)
+
+    def handle(self, event: Event) -> None:
+        key = (event["name"], tuple(sorted(event["labels"].items())))
+        with self._lock:
+            if event["type"] == "span":
+                totals = self.spans.setdefault(key, [0.0, 0])
+                totals[0] += event["value"]
+                totals[1] += 1
+            else:
+                self.counters[key] = self.counters.get(key, 0) + event["value"]
+        if self.path is not None and time.monotonic() - self._written >= self.write_interval:
+            self.write()
+
+    @staticmethod
+    def _labels(labels: Tuple) -> str:
+        return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}" if labels else ""
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {self.PREFIX}_{name}_total counter")
+                lines += [
+                    f"{self.PREFIX}_{name}_total{self._labels(labels)} {value}"
+                    for (counter, labels), value in self.counters.items() if counter == name
+                ]
+            if self.spans:
+                lines.append(f"# TYPE {self.PREFIX}_span_seconds summary")
+            for (name, labels), (total, count) in self.spans.items():
+                span_labels = self._labels((("span", name),) + labels)
+                lines.append(f"{self.PREFIX}_span_seconds_sum{span_labels} {total}")
+                lines.append(f"{self.PREFIX}_span_seconds_count{span_labels} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        self._written = time.monotonic()
+        with open(f"{self.path}.tmp", "w") as file:
+            file.write(self.render())
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+class _Span:
+
+    def __init__(self, instrumentation: "Instrumentation", name: str, labels: Dict[str, Any]) -> None:
+        self.instrumentation = instrumentation
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, error_type, error, traceback) -> None:
+        if error_type is not None:
+            self.labels["error"] = error_type.__name__
+        self.instrumentation.emit("span", self.name, time.perf_counter() - self.start, self.labels)
+
+
+_NULL_SPAN = nullcontext()
+
+
+class Instrumentation:
+
+    def __init__(self, sinks: Optional[List[Any]] = None) -> None:
+        self.sinks = sinks or []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def emit(self, event_type: str, name: str, value: float, labels: Dict[str, Any]) -> None:
+        event = {"type": event_type, "name": name, "labels": labels, "value": value, "time": time.time()}
+        for sink in self.sinks:
+            try:
+                sink.handle(event)
+            except Exception as e:  # Instrumentation never breaks what it measures
+                logging.getLogger("insider_trading.metrics").warning(f"Metrics sink {type(sink).__name__} failed: {e}")
+
+    def span(self, name: str, **labels: Any):
+        """Context manager timing its block as the span `name`."""
+        if not self.sinks:
+            return _NULL_SPAN
+        return _Span(self, name, labels)
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Adds `value` to the counter `name`."""
+        if self.sinks:
+            self.emit("counter", name, value, labels)
+
+
+def sinks_from_spec(spec: str) -> List[Any]:
+    """Sinks described by `spec`, e.g. "log,jsonl=metrics.jsonl,prometheus=metrics.prom"."""
+    sinks = []
+    for item in filter(None, (item.strip() for item in spec.split(","))):
+        kind, _, path = item.partition("=")
+        if kind == "log":
+            sinks.append(LoggingSink())
+        elif kind == "jsonl" and path:
+            sinks.append(JsonLinesSink(path))
+        elif kind == "prometheus":
+            sinks.append(PrometheusSink(path or None))
+        else:
+            raise ValueError(f"{item}: Invalid metrics sink; use log, jsonl=<path> or prometheus[=<path>]")
+    return sinks
+
+
+INSTRUMENTATION = Instrumentation(sinks_from_spec(os.environ.get("INSIDER_TRADING_METRICS", "")))
+
+
+def configure(sinks: List[Any]) -> None:
+    """Sends the spans and counters of the process to `sinks` (none disables instrumentation)."""
+    INSTRUMENTATION.sinks = list(sinks)
+
+
+def span(name: str, **labels: Any):
+    """Times a block as the span `name`, e.g. `with span("fetch", host="openinsider.com"): ...`."""
+    if not INSTRUMENTATION.sinks:
+        return _NULL_SPAN
+    return _Span(INSTRUMENTATION, name, labels)
+
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    """Adds `value` to the counter `name`, e.g. `count("cache_hits", cache="memory")`."""
+    if INSTRUMENTATION.sinks:
+        INSTRUMENTATION.emit("counter", name, value, labels)
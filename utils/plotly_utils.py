@@ -9,14 +9,17 @@ def create_time_series_chart(
     x: str,
     aggregation: str,
     groupby: str,
-    title: str
+    title: str,
+    color: str | None = None,
 ) -> go.Figure:
-    """Generates a time series chart for temporal groupings."""
+    """Generates a time series chart for temporal groupings, with one series per `color` value if given."""
     df.sort_values(by=x, inplace=True)
-    if groupby == "Month":
+    if groupby in ["Month", "Quarter"]:
         df[x] = df[x].astype(str)  # Ensure categorical ordering
         fig = px.bar(
             df, x=x, y=aggregation,
+            color=color,
+            barmode="group",
             title=title,
             labels={x: groupby, aggregation: aggregation},
         )
@@ -24,6 +27,7 @@ def create_time_series_chart(
     else:
         fig = px.line(
             df, x=x, y=aggregation,
+            color=color,
             title=title,
             labels={x: groupby, aggregation: aggregation},
         )
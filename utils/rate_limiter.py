@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+COUNTERS = ["requests", "bytes", "cache_hits", "throttled", "wait_seconds"]
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average and bursts of up to `burst`. Callers reserve tokens and wait for
+    their turn outside the lock, so a request larger than the burst waits for the tokens it is short of.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"({rate}, {burst}): `rate` must be positive and `burst` at least 1.")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Takes `tokens`, waiting until they are available; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            wait = max(0.0, -self.tokens / self.rate)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Makes the next requests wait at least `seconds`, e.g. after the host asked to slow down."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class RateLimiter:
+    """
+    Token buckets shared by every client of a host, with per-host budgets, and per-host counters of requests,
+    bytes received, cache hits (requests answered without a download), throttling responses (429s) and time waited.
+    """
+
+    # (requests per second, burst) of each host; hosts match their subdomains
+    DEFAULT_BUDGETS: Dict[str, Tuple[float, float]] = {
+        "openinsider.com": (2.0, 4),
+        "finance.yahoo.com": (5.0, 20),
+    }
+    DEFAULT_BUDGET = (10.0, 20)
+    THROTTLE_PAUSE = 5.0  # Seconds paused after a 429 without a Retry-After header
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+        default_budget: Optional[Tuple[float, float]] = None,
+    ) -> None:
+        self.budgets = self.DEFAULT_BUDGETS if budgets is None else budgets
+        self.default_budget = default_budget or self.DEFAULT_BUDGET
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def budget_key(self, host: str) -> str:
+        """Budget `host` is limited by: the budgeted domain it belongs to, or the host itself."""
+        if "://" in host:
+            host = urlparse(host).hostname or host
+        return next((domain for domain in self.budgets if host == domain or host.endswith(f".{domain}")), host)
+
+    def bucket(self, host: str) -> TokenBucket:
+        key = self.budget_key(host)
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(*self.budgets.get(key, self.default_budget))
+            return self._buckets[key]
+
+    def record(self, host: str, **counts: float) -> None:
+        """Adds `counts` (of `COUNTERS`) to the counters of `host`."""
+        key = self.budget_key(host)
+        with self._lock:
+            counters = self._counters.setdefault(key, dict.fromkeys(COUNTERS, 0))
+            for name, count in counts.items():
+                counters[name] += count
+
+    def acquire(self, host: str, requests: int = 1) -> None:
+        """Waits for the budget of `requests` requests to `host` (a host name or URL), and counts them."""
+        waited = self.bucket(host).acquire(requests)
+        self.record(host, requests=requests, wait_seconds=waited)
+
+    def throttled(self, host: str, retry_after: Optional[float] = None, responses: int = 1) -> None:
+        """Counts `responses` throttling responses from `host` and pauses every request to it."""
+        self.bucket(host).pause(self.THROTTLE_PAUSE if retry_after is None else retry_after)
+        self.record(host, throttled=responses)
+
+    def counters(self) -> Dict[str, Dict[str, float]]:
+        """Snapshot of the counters of each host."""
+        with self._lock:
+            return {host: dict(counters) for host, counters in self._counters.items()}
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+RATE_LIMITER = RateLimiter()  # Shared by every client of the process
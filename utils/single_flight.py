@@ -0,0 +1,50 @@
+import threading
+from typing import Any, Callable, Dict, Generic, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call:
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """
+    Collapses concurrent calls for the same key into one: the first caller runs the function, and callers arriving
+    while it runs wait for it and share its result (or exception). Results are not kept once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, function: Callable[[], T]) -> Tuple[T, bool]:
+        """Result of `function` (or of the in-flight call for `key`), and whether it is shared with another caller."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def __len__(self) -> int:
+        return len(self._calls)
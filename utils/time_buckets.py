@@ -0,0 +1,80 @@
+import re
+from typing import Dict, Hashable, Tuple
+import numpy as np
+import pandas as pd
+
+from consts import TEMPORAL_GBS
+
+
+TIME_BUCKETS = TEMPORAL_GBS
+MISSING_CODE = np.iinfo(np.int64).min  # Code of missing dates (NaT), skipped when aggregating
+
+_N_DAYS_BUCKET = re.compile(r"^(\d+) Days$")  # Custom buckets of N days, e.g. "14 Days"
+
+
+def is_time_bucket(bucket: str) -> bool:
+    return bucket in TIME_BUCKETS or _N_DAYS_BUCKET.match(bucket) is not None
+
+
+def n_days_bucket(n_days: int) -> str:
+    return f"{n_days} Days"
+
+
+def day_codes(dates: pd.Series | np.ndarray) -> np.ndarray:
+    """Days since 1970-01-01 of each date, or `MISSING_CODE` for missing dates."""
+    days = np.asarray(dates, dtype="datetime64[D]")
+    return np.where(np.isnat(days), MISSING_CODE, days.astype(np.int64))
+
+
+def bucket_codes(days: np.ndarray, bucket: str) -> np.ndarray:
+    """
+    Integer code of the `bucket` containing each of `days` (as returned by `day_codes`); codes increase with time.
+    Weeks start on Monday and custom N-day buckets are counted from 1970-01-01.
+    """
+    missing = days == MISSING_CODE
+    if bucket == "Day":
+        return days
+    elif bucket == "Week":
+        codes = (days + 3) // 7  # 1970-01-01 is a Thursday
+    elif bucket in ("Month", "Quarter", "Year"):
+        months = np.where(missing, 0, days).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        codes = {"Month": months, "Quarter": months // 3, "Year": months // 12}[bucket]
+    elif _N_DAYS_BUCKET.match(bucket):
+        codes = days // int(_N_DAYS_BUCKET.match(bucket).group(1))
+    else:
+        raise ValueError(f"{bucket}: Invalid time bucket; choose from {TIME_BUCKETS} or '<N> Days'")
+    return np.where(missing, MISSING_CODE, codes)
+
+
+def bucket_labels(codes: np.ndarray, bucket: str) -> np.ndarray:
+    """
+    Label of each bucket code: the first day of the bucket for days, weeks and custom buckets,
+    "YYYY-MM" for months, "YYYYQn" for quarters and the year for years.
+    """
+    if bucket == "Day":
+        return codes.astype("datetime64[D]").astype("datetime64[ns]")
+    elif bucket == "Week":
+        return (codes * 7 - 3).astype("datetime64[D]").astype("datetime64[ns]")
+    elif bucket == "Month":
+        return np.datetime_as_string(codes.astype("datetime64[M]"), unit="M")
+    elif bucket == "Quarter":
+        return np.array([f"{1970 + code // 4}Q{code % 4 + 1}" for code in codes], dtype=object)
+    elif bucket == "Year":
+        return 1970 + codes
+    n_days = int(_N_DAYS_BUCKET.match(bucket).group(1))
+    return (codes * n_days).astype("datetime64[D]").astype("datetime64[ns]")
+
+
+def group_sums(codes: np.ndarray, metrics: Dict[Hashable, np.ndarray]) -> Tuple[np.ndarray, Dict[Hashable, np.ndarray]]:
+    """
+    Sorted distinct `codes` (other than `MISSING_CODE`) and the sum of each of `metrics` per code, all computed
+    from a single factorization of `codes`; missing metric values count as 0.
+    """
+    valid = codes != MISSING_CODE
+    uniques, inverse = np.unique(codes[valid], return_inverse=True)
+    sums = {
+        name: np.bincount(inverse, weights=np.nan_to_num(np.asarray(values, dtype=float)[valid]), minlength=len(uniques))
+        for name, values in metrics.items()
+    }
+    return uniques, sums
+
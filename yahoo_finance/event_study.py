@@ -0,0 +1,155 @@
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+from open_insider.parameters.job_titles import JobTitlesParam
+from yahoo_finance.formatting_utils import strip_stock_symbol
+from yahoo_finance.price_cache import PriceCache
+from yahoo_finance.stocks_data_loader import StocksDataLoader
+from utils.instrumentation import span
+
+
+HORIZONS = {"1d": 1, "1w": 5, "1m": 21, "6m": 126}  # Trading days (daily bars) after the entry bar
+BENCHMARK = "SPY"
+MAX_PRICE_GAP_DAYS = 7  # Closes further than this after a date are not used as that date's price
+MARKET_CLOSE = pd.Timedelta(hours=16)  # Daily bars close at 16:00 US Eastern, the time zone of filing times
+SIZE_BUCKETS = {
+    "< $100K": 1e5,
+    "$100K - $1M": 1e6,
+    "$1M - $10M": 1e7,
+    "> $10M": np.inf,
+}
+
+
+def load_price_panel(
+    tickers: Iterable[str],
+    start_date: str,
+    end_date: Optional[str] = None,
+    benchmark: str = BENCHMARK,
+    cache: Optional[PriceCache] = None,
+) -> pd.DataFrame:
+    """
+    Daily closes of `tickers` and `benchmark` as a long (Date, Ticker, Close) frame, read from the price cache
+    after downloading only its missing ranges in bulk. Tickers without prices are left out.
+    """
+    cache = cache or PriceCache()
+    symbols = sorted({strip_stock_symbol(ticker) for ticker in tickers} | {benchmark})
+    with span("price_load"):
+        StocksDataLoader(symbols, start_date, end_date, cache=cache).update_cache()
+        closes = {}
+        for symbol in symbols:
+            data = cache.read(symbol, start_date, end_date)
+            if not data.empty:
+                closes[symbol] = data["Close"].dropna()
+    if not closes:
+        return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), "Ticker": pd.Series(dtype=str), "Close": []})
+    panel = pd.concat(closes, names=["Ticker", "Date"]).rename("Close").reset_index()
+    panel["Date"] = panel["Date"].astype("datetime64[ns]")
+    return panel[["Date", "Ticker", "Close"]]
+
+
+def _closes_on_or_after(prices: pd.DataFrame, dates: np.ndarray, tickers: Optional[np.ndarray] = None) -> np.ndarray:
+    """First close on or after each of `dates` (of the matching ticker, if `tickers` is given), aligned with `dates`."""
+    events = pd.DataFrame({"Date": dates, "Position": np.arange(len(dates))})
+    if tickers is not None:
+        events["Ticker"] = tickers
+    events = events.dropna(subset=["Date"]).sort_values("Date", kind="stable")
+    matched = pd.merge_asof(
+        events,
+        prices.sort_values("Date", kind="stable"),
+        on="Date",
+        by="Ticker" if tickers is not None else None,
+        direction="forward",
+        tolerance=pd.Timedelta(days=MAX_PRICE_GAP_DAYS),
+    )
+    closes = np.full(len(dates), np.nan)
+    closes[matched["Position"].to_numpy()] = matched["Close"].to_numpy()
+    return closes
+
+
+def price_window_days(horizons: Dict[str, int] = HORIZONS) -> int:
+    """Calendar days of prices needed after a filing to reach the exit of every horizon."""
+    return int(np.ceil(max(horizons.values()) * 7 / 5)) + 2 * MAX_PRICE_GAP_DAYS  # Weekends, holidays and gaps
+
+
+def _entry_rows(prices: pd.DataFrame, filed: np.ndarray, tickers: np.ndarray) -> np.ndarray:
+    """
+    Row of `prices` (sorted by ticker and date) holding each trade's entry bar: the first daily bar of its ticker
+    closing after the filing time, so after-hours filings enter on the next session; -1 if there is none.
+    """
+    events = pd.DataFrame({"Date": filed - MARKET_CLOSE, "Ticker": tickers, "Position": np.arange(len(filed))})
+    events = events.dropna(subset=["Date"]).sort_values("Date", kind="stable")
+    bars = prices[["Date", "Ticker"]].assign(Row=np.arange(len(prices))).sort_values("Date", kind="stable")
+    matched = pd.merge_asof(
+        events,
+        bars,
+        on="Date",
+        by="Ticker",
+        direction="forward",
+        allow_exact_matches=False,  # Bar D closes at D + MARKET_CLOSE; only closes after the filing
+        tolerance=pd.Timedelta(days=MAX_PRICE_GAP_DAYS),
+    )
+    rows = np.full(len(filed), -1)
+    rows[matched["Position"].to_numpy()] = matched["Row"].fillna(-1).to_numpy(dtype=np.int64)
+    return rows
+
+
+def forward_returns(
+    trades: pd.DataFrame,
+    prices: pd.DataFrame,
+    horizons: Dict[str, int] = HORIZONS,
+    benchmark: str = BENCHMARK,
+    date_column: str = "Filing Date",
+) -> pd.DataFrame:
+    """
+    Return of each trade's ticker from its entry bar, the first daily close after its `date_column` time (when the
+    trade became public), to the close each of `horizons` trading days later, and the excess over `benchmark`'s
+    return between the same dates. Computed for all trades at once with an as-of merge against the long `prices`
+    panel (see `load_price_panel`); NaN where prices are missing or a horizon has not elapsed yet.
+    """
+    prices = prices.sort_values(["Ticker", "Date"], kind="stable", ignore_index=True)
+    closes = prices["Close"].to_numpy(dtype=float)
+    price_tickers = prices["Ticker"].to_numpy()
+    price_dates = prices["Date"].to_numpy(dtype="datetime64[ns]")
+    benchmark_prices = prices.loc[prices["Ticker"] == benchmark, ["Date", "Close"]]
+    tickers = trades["Ticker"].map(strip_stock_symbol).astype(str).to_numpy()
+    entry_rows = _entry_rows(prices, trades[date_column].astype("datetime64[ns]").to_numpy(), tickers)
+    has_entry = entry_rows >= 0
+    entry = np.where(has_entry, closes[entry_rows], np.nan)
+    entry_dates = np.where(has_entry, price_dates[entry_rows], np.datetime64("NaT"))
+    benchmark_entry = _closes_on_or_after(benchmark_prices, entry_dates)
+    returns = {}
+    for horizon, num_bars in horizons.items():
+        exit_rows = np.where(has_entry, entry_rows + num_bars, len(prices))
+        has_exit = exit_rows < len(prices)
+        has_exit[has_exit] = price_tickers[exit_rows[has_exit]] == price_tickers[entry_rows[has_exit]]
+        exit_rows = np.where(has_exit, exit_rows, 0)
+        stock_return = np.where(has_exit, closes[exit_rows], np.nan) / entry - 1
+        exit_dates = np.where(has_exit, price_dates[exit_rows], np.datetime64("NaT"))
+        benchmark_return = _closes_on_or_after(benchmark_prices, exit_dates) / benchmark_entry - 1
+        returns[f"Return {horizon}"] = stock_return
+        returns[f"Excess Return {horizon}"] = stock_return - benchmark_return
+    return pd.DataFrame(returns, index=trades.index)
+
+
+def average_returns_by_title(trades: pd.DataFrame, returns: pd.DataFrame) -> pd.DataFrame:
+    """Mean of each of `returns` over the trades of insiders holding each title (insiders with several titles count for each)."""
+    title_masks = trades["Title Mask"].to_numpy()
+    rows = {}
+    for bit, job_title in enumerate(JobTitlesParam.JOB_TITLE_MAP):
+        has_title = (title_masks & (1 << bit)) != 0
+        if has_title.any():
+            rows[job_title] = returns[has_title].mean().to_dict() | {"Trades": int(has_title.sum())}
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("Title")
+
+
+def average_returns_by_size(trades: pd.DataFrame, returns: pd.DataFrame) -> pd.DataFrame:
+    """Mean of each of `returns` over the trades of each `SIZE_BUCKETS` bucket of |Value|."""
+    buckets = pd.cut(
+        trades["Value"].abs(),
+        bins=[0] + list(SIZE_BUCKETS.values()),
+        labels=list(SIZE_BUCKETS),
+        include_lowest=True,
+    ).rename("Size")
+    grouped = returns.groupby(buckets, observed=True)
+    return grouped.mean().assign(Trades=grouped.size())
@@ -0,0 +1,146 @@
+import os
+import json
+import threading
+from typing import List, Tuple, Dict, Optional
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr, USMemorialDay, USPresidentsDay,
+    USThanksgivingDay, nearest_workday, sunday_to_monday,
+)
+
+from consts import DATA_DIR
+
+
+_LOCK = threading.Lock()  # Serializes the cache file reads and writes of every cache instance in the process
+
+
+class ExchangeHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day closures of the US stock exchanges (one-off closures aside)."""
+
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+class PriceCache:
+    """
+    Local per-ticker OHLCV cache (one Parquet file per ticker) that records which date range it holds,
+    so requests only download the missing part of their range.
+
+    Ranges follow `yf.download`: `start` inclusive, `end` exclusive.
+    """
+
+    def __init__(self, root: str = os.path.join(DATA_DIR, "prices")) -> None:
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.root, "meta.json")
+
+    def path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.parquet")
+
+    def _read_meta(self) -> Dict[str, List[Tuple[str, str]]]:
+        if not os.path.exists(self.meta_path):
+            return {}
+        with open(self.meta_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _atomic_write(path: str, write) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, meta: Dict[str, List[Tuple[str, str]]]) -> None:
+        def _write(path: str) -> None:
+            with open(path, "w") as f:
+                json.dump(meta, f)
+        self._atomic_write(self.meta_path, _write)
+
+    def covered(self, ticker: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Disjoint date ranges held for `ticker`, in order."""
+        ranges = self._read_meta().get(ticker) or []
+        if ranges and isinstance(ranges[0], str):  # Single range, as recorded before ranges were listed
+            ranges = [ranges]
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in ranges]
+
+    @staticmethod
+    def _merge_ranges(ranges: List[Tuple[pd.Timestamp, pd.Timestamp]]) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    @staticmethod
+    def _cap_end(end: Optional[str]) -> pd.Timestamp:
+        """Today's bar is still forming, so it is never treated as cached."""
+        today = pd.Timestamp.today().normalize()
+        return min(pd.Timestamp(end), today) if end is not None else today
+
+    @staticmethod
+    def is_closed(start: pd.Timestamp, end: pd.Timestamp) -> bool:
+        """Whether the exchanges hold no session in [start, end), e.g. over a weekend or a holiday."""
+        sessions = pd.bdate_range(start, end - pd.Timedelta(days=1))
+        return sessions.difference(ExchangeHolidayCalendar().holidays(start, end)).empty
+
+    def missing_ranges(self, ticker: str, start: str, end: Optional[str] = None) -> List[Tuple[str, str]]:
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        missing = []
+        cursor = start
+        for covered_start, covered_end in self.covered(ticker):
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if cursor < covered_start:
+                missing.append((cursor, covered_start))
+            cursor = covered_end
+        if cursor < end:
+            missing.append((cursor, end))
+        return [(s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d")) for s, e in missing]
+
+    def read(self, ticker: str, start: str, end: Optional[str] = None) -> pd.DataFrame:
+        with _LOCK:
+            if not os.path.exists(self.path(ticker)):
+                return pd.DataFrame()
+            df = pd.read_parquet(self.path(ticker))
+        mask = df.index >= pd.Timestamp(start)
+        if end is not None:
+            mask &= df.index < pd.Timestamp(end)
+        return df[mask]
+
+    def write(self, ticker: str, df: pd.DataFrame, start: str, end: Optional[str] = None) -> None:
+        """
+        Merges a download of `ticker` for [start, end) into the cache and adds the range to its covered ranges.
+        A download without bars only covers a range without sessions: Yahoo also answers failed or throttled
+        requests with no bars, so the range is downloaded again next time.
+        """
+        df = df.dropna(how="all")
+        start, end = pd.Timestamp(start), self._cap_end(end)
+        with _LOCK:
+            if not df.empty:
+                if os.path.exists(self.path(ticker)):
+                    df_existing = pd.read_parquet(self.path(ticker))
+                    df = pd.concat([df_existing[~df_existing.index.isin(df.index)], df]).sort_index()
+                df.columns = df.columns.astype(str)
+                self._atomic_write(self.path(ticker), df.to_parquet)
+            if start < end and (not df.empty or self.is_closed(start, end)):
+                meta = self._read_meta()
+                ranges = self._merge_ranges(self.covered(ticker) + [(start, end)])
+                meta[ticker] = [(s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d")) for s, e in ranges]
+                self._write_meta(meta)
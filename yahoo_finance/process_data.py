@@ -2,6 +2,7 @@ from typing import Tuple, List
 import pandas as pd
 from datetime import datetime
 
+from open_insider.trade_index import get_trade_index
 from yahoo_finance.stocks_data_loader import StocksDataLoader
 
 
@@ -29,8 +30,7 @@ def get_ticker_trades_and_stock_data(
     ticker: str,
     window: int = 180 # days (lb - window, ub + window)
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    ticker_trading_data = trading_data[trading_data["Ticker"] == ticker]
-    ticker_trading_data["Trade Date"] = pd.to_datetime(ticker_trading_data["Trade Date"])
+    ticker_trading_data = get_trade_index(trading_data).ticker_trades(trading_data, ticker)
     min_date = ticker_trading_data["Trade Date"].min()
     min_date = min_date - pd.Timedelta(days=window)
     max_date = ticker_trading_data["Trade Date"].max()
@@ -43,4 +43,4 @@ def get_ticker_trades_and_stock_data(
         min_date.strftime("%Y-%m-%d"),
         max_date.strftime("%Y-%m-%d"),
     )
-    return ticker_trading_data, ticker_stock_data
\ No newline at end of file
+    return ticker_trading_data, ticker_stock_data
@@ -1,12 +1,64 @@
-from typing import Union, Iterable, Optional, Callable, Any, Dict
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Union, Iterable, Iterator, Optional, Callable, Any, Dict, List, Tuple
 import yfinance as yf
+from yfinance import shared as yf_shared
+from yfinance.exceptions import YFRateLimitError
 import pandas as pd
-import streamlit as st
 
 from yahoo_finance.formatting_utils import strip_stock_symbol
+from yahoo_finance.price_cache import PriceCache
+from utils.instrumentation import span
+from utils.rate_limiter import RateLimiter, RATE_LIMITER
 from utils.wrapper_utils import wrapper
 
 
+YAHOO_HOST = "finance.yahoo.com"
+RATE_LIMITED = re.compile(r"RateLimit|Too Many Requests|\b429\b", re.IGNORECASE)
+
+
+class _ThreadErrors(logging.Handler):
+    """Collects the error messages logged by the thread that created it."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread == self.thread:
+            self.messages.append(record.getMessage())
+
+
+@contextmanager
+def download_errors() -> Iterator[List[str]]:
+    """
+    Errors of the `yf.download` calls made in the block by this thread. yfinance turns per-ticker failures (rate
+    limits included) into empty prices, and reports them in `yfinance.shared._ERRORS` (before 1.0) or in its log.
+    """
+    handler = _ThreadErrors()
+    logger = logging.getLogger("yfinance")
+    logger.addHandler(handler)
+    try:
+        yield handler.messages
+    finally:
+        logger.removeHandler(handler)
+        handler.messages += [str(error) for error in getattr(yf_shared, "_ERRORS", {}).values()]
+
+
+class InvalidTickersError(Exception):
+    """Raised when neither the price cache nor the download hold any prices for some tickers."""
+
+    def __init__(self, tickers: List[str]) -> None:
+        self.tickers = tickers
+        super().__init__(f"The following tickers are invalid: {tickers}")
+
+
 class StocksDataLoader:
     
     def __init__(
@@ -14,35 +66,66 @@ class StocksDataLoader:
         symbols: Union[str, Iterable[str]],
         start_date: str,
         end_date: Optional[str] = None,
-        verbose: int = 0
+        verbose: int = 0,
+        cache: Optional[PriceCache] = None,
+        max_workers: int = 4,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         self.symbols = self.obj2list(symbols)
-        [symbols] if isinstance(symbols, str) else list(symbols)
         self.symbols = list(map(strip_stock_symbol, self.symbols))
-        invalid_tickers = [symbol for symbol in self.symbols if not self.is_ticker_valid(symbol)]
-        if len(invalid_tickers) > 0:
-            error = f"The following tickers are invalid: {invalid_tickers}"
-            st.error(error)
-            raise Exception(error)
         self.start_date = start_date
         self.end_date = end_date
         self.verbose = verbose
+        self.cache = cache or PriceCache()
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RATE_LIMITER
         self._data = None
     
     @staticmethod
     def obj2list(obj: Any) -> list:
         return [obj] if isinstance(obj, str) else list(obj)
     
-    @staticmethod
-    def is_ticker_valid(ticker: str):
+    def download_batch(
+        self,
+        batch_symbols: List[str],
+        start_date: str,
+        end_date: Optional[str] = None,
+        retries: int = 2,
+        threads: bool = True,
+    ) -> pd.DataFrame:
         """
-        Checks if a ticker is available via the Yahoo Finance API.
+        Downloads one batch of symbols. The symbols without prices are downloaded again, with backoff, if the
+        download failed, returned no prices at all or was throttled. Each symbol takes one request of Yahoo's
+        rate-limit budget, and throttling pauses the budget. yfinance does not expose its responses, so no bytes
+        are counted for Yahoo.
         """
-        info = yf.Ticker(ticker).history(
-            period='7d',
-            interval='1d'
-        )
-        return len(info) > 0
+        downloaded = []
+        pending = list(batch_symbols)
+        for attempt in range(retries + 1):
+            self.rate_limiter.acquire(YAHOO_HOST, requests=len(pending))
+            try:
+                with download_errors() as errors:
+                    data: pd.DataFrame = yf.download(
+                        pending, start=start_date, end=end_date, progress=bool(self.verbose), threads=threads
+                    )
+            except Exception as error:
+                if isinstance(error, YFRateLimitError):
+                    self.rate_limiter.throttled(YAHOO_HOST)
+                if attempt == retries:
+                    raise
+                time.sleep(0.5 * 2 ** attempt)
+                continue
+            num_throttled = sum(bool(RATE_LIMITED.search(error)) for error in errors)
+            if num_throttled:
+                self.rate_limiter.throttled(YAHOO_HOST, responses=num_throttled)
+            tickers = set(data.dropna(axis=1, how="all").columns.get_level_values("Ticker"))
+            downloaded.append(data.loc[:, data.columns.get_level_values("Ticker").isin(tickers)])
+            pending = [symbol for symbol in pending if symbol not in tickers]
+            if not pending or attempt == retries or (tickers and not num_throttled):
+                break
+            if not num_throttled:  # A throttled host is paused by the rate limiter instead
+                time.sleep(0.5 * 2 ** attempt)
+        return pd.concat(downloaded, axis=1)
 
     def download_and_clean_data(
         self,
@@ -50,22 +133,83 @@ class StocksDataLoader:
         start_date: str,
         end_date: Optional[str] = None,
         batch_size: Optional[int] = 10,
+        max_workers: int = 1,
+        retries: int = 2,
+        tidy: bool = False,
     ) -> pd.DataFrame:
+        """
+        Downloads `symbols` in batches of `batch_size`, `max_workers` batches at a time.
+
+        Returns a wide frame with (Ticker, Price) columns, or with `tidy=True` a long frame with one row per
+        (Date, Ticker), which avoids re-sorting and concatenating wide column MultiIndexes.
+        """
         symbols = self.obj2list(symbols)
+        batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+        download = partial(
+            self.download_batch, start_date=start_date, end_date=end_date, retries=retries, threads=max_workers <= 1
+        )
+        if max_workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                batches_data = list(executor.map(download, batches))
+        else:
+            batches_data = [download(batch) for batch in batches]
+        batches_data = [data for data in batches_data if not data.empty]
+        if not batches_data:
+            return pd.DataFrame()
+
+        if tidy:
+            all_data = pd.concat(
+                [data.stack(level="Ticker", future_stack=True).dropna(how="all") for data in batches_data]
+            ).reset_index()
+            all_data.columns.name = None
+            return all_data
         all_data = []
-        for i in range(0, len(symbols), batch_size):
-            batch_symbols = symbols[i:i + batch_size]
-            data: pd.DataFrame = yf.download(batch_symbols, start=start_date, end=end_date, progress=bool(self.verbose))
+        for data in batches_data:
             data.columns = data.columns.swaplevel(0, 1)
             data.sort_index(axis=1, level=0, inplace=True)
             all_data.append(data)
-        
-        return pd.concat(all_data, axis=1) if all_data else pd.DataFrame()
+        return pd.concat(all_data, axis=1)
     
+    def update_cache(self) -> None:
+        """
+        Downloads only the date ranges missing from the price cache, in one bulk download per range (retried by
+        `download_batch` when it returns no prices at all).
+        """
+        missing_symbols: Dict[Tuple[str, str], List[str]] = {}
+        num_cached = 0
+        for symbol in self.symbols:
+            missing_ranges = self.cache.missing_ranges(symbol, self.start_date, self.end_date)
+            num_cached += not missing_ranges
+            for date_range in missing_ranges:
+                missing_symbols.setdefault(date_range, []).append(symbol)
+        self.rate_limiter.record(YAHOO_HOST, cache_hits=num_cached)
+        for (start_date, end_date), symbols in missing_symbols.items():
+            downloaded = self.download_and_clean_data(
+                symbols, start_date, end_date=end_date, max_workers=self.max_workers, tidy=True
+            )
+            symbols_data = dict(tuple(downloaded.groupby("Ticker"))) if not downloaded.empty else {}
+            for symbol in symbols:
+                # Symbols without bars are passed on too: a range without sessions is still recorded as covered
+                symbol_data = symbols_data.get(symbol, pd.DataFrame(columns=["Ticker", "Date"]))
+                self.cache.write(symbol, symbol_data.drop(columns="Ticker").set_index("Date"), start_date, end_date)
+
+    def load_data(self) -> pd.DataFrame:
+        """
+        Updates the price cache, then reads every symbol from it. Symbols for which neither the cache nor
+        the download hold any prices are invalid.
+        """
+        with span("price_load"):
+            self.update_cache()
+            symbols_data = {symbol: self.cache.read(symbol, self.start_date, self.end_date) for symbol in self.symbols}
+        invalid_tickers = [symbol for symbol, data in symbols_data.items() if data.empty]
+        if len(invalid_tickers) > 0:
+            raise InvalidTickersError(invalid_tickers)
+        return pd.concat(symbols_data, axis=1, names=["Ticker", "Price"])
+
     @property
     def data(self) -> pd.DataFrame:
         if self._data is None:
-            self._data = self.download_and_clean_data(self.symbols, self.start_date, end_date=self.end_date)
+            self._data = self.load_data()
         return self._data
 
     def get_data(